@@ -16,7 +16,13 @@ To determine the supported actions run ``nox --list-sessions`` from the
 project root.
 """
 
+import glob
+import hashlib
+import json
 import os
+import shutil
+import subprocess
+import sys
 
 import nox
 import py.path
@@ -24,6 +30,10 @@ import py.path
 
 NOX_DIR = os.path.abspath(os.path.dirname(__file__))
 SINGLE_INTERP = "python3.6"
+# Upper bound on ``pdflatex`` passes when waiting for a fixed point.
+MAX_LATEX_PASSES = 6
+# Auxiliary files that must stop changing before the build is done.
+FIXED_POINT_EXTENSIONS = ("aux", "toc", "out")
 
 
 def get_path(*names):
@@ -41,22 +51,149 @@ class Remove(object):
             os.remove(path)
 
 
-def build_tex_file(session, base, new_id, extensions=()):
-    # NOTE: This assumes that ``session.chdir(get_path('doc'))``
-    #       has been called.
-    modify_id = get_path("scripts", "modify_pdf_id.py")
+def hash_files(paths):
+    hasher = hashlib.sha256()
+    for path in paths:
+        hasher.update(os.path.basename(path).encode("utf-8"))
+        if os.path.exists(path):
+            with open(path, "rb") as file_obj:
+                hasher.update(hashlib.sha256(file_obj.read()).digest())
+        else:
+            hasher.update(b"missing")
+    return hasher.hexdigest()
+
+
+class BuildTex(object):
+    """Build a LaTeX document, only doing the work that is needed.
+
+    * The build is skipped if neither the inputs (the ``.tex`` file, any
+      ``.bib`` files and the figures) nor the output PDF have changed
+      since the last build.
+    * The auxiliary files from the last build are restored (they are
+      stashed in ``.cache/build_tex/`` before being removed), so
+      ``pdflatex`` is run until the ``.aux``, ``.toc`` and ``.out``
+      files reach a fixed point, which is often after a single pass.
+    * ``bibtex`` is only run when the ``.bbl`` file is missing or the
+      citations (or ``.bib`` files) have changed.
+
+    This is a callable, like :class:`Remove`, so that it runs when the
+    session runs.
+    """
+
+    def __init__(self, doc_dir, base, new_id, extensions=()):
+        self.doc_dir = doc_dir
+        self.base = base
+        self.new_id = new_id
+        self.extensions = extensions
+        self.cache_dir = get_path(".cache", "build_tex")
+        self.state_path = os.path.join(self.cache_dir, base + ".json")
+        self.stash_dir = os.path.join(self.cache_dir, base)
+
+    def doc_path(self, extension):
+        return os.path.join(self.doc_dir, "{}.{}".format(self.base, extension))
+
+    def input_paths(self):
+        output = self.doc_path("pdf")
+        paths = [self.doc_path("tex")]
+        for pattern in ("*.bib", "*.bst", "*.cls", "*.sty", "*.pdf"):
+            matches = glob.glob(os.path.join(self.doc_dir, pattern))
+            paths.extend(sorted(path for path in matches if path != output))
+        return paths
+
+    def load_state(self):
+        try:
+            with open(self.state_path, "r") as file_obj:
+                return json.load(file_obj)
+        except (IOError, ValueError):
+            return {}
 
-    session.run("pdflatex", base)
-    session.run("bibtex", base)
-    session.run("pdflatex", base)
-    session.run("bibtex", base)
-    session.run("pdflatex", base)
-    session.run("pdflatex", base)
+    def save_state(self, state):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.state_path, "w") as file_obj:
+            json.dump(state, file_obj, indent=2, sort_keys=True)
+            file_obj.write("\n")
+
+    def bibtex_key(self):
+        """Hash the citations (and bibliography) used by the document."""
+        lines = []
+        with open(self.doc_path("aux"), "r") as file_obj:
+            for line in file_obj:
+                if line.startswith(("\\citation", "\\bibdata", "\\bibstyle")):
+                    lines.append(line)
+        bib_paths = sorted(glob.glob(os.path.join(self.doc_dir, "*.bib")))
+        return hash_files(bib_paths) + "|" + hashlib.sha256(
+            "".join(lines).encode("utf-8")
+        ).hexdigest()
+
+    def run(self, *args):
+        print(" ".join(args))
+        subprocess.check_call(args, cwd=self.doc_dir)
+
+    def stash(self, restore=False):
+        for extension in self.extensions:
+            stashed = os.path.join(self.stash_dir, extension)
+            if restore:
+                if os.path.exists(stashed):
+                    shutil.copyfile(stashed, self.doc_path(extension))
+            elif os.path.exists(self.doc_path(extension)):
+                os.makedirs(self.stash_dir, exist_ok=True)
+                shutil.copyfile(self.doc_path(extension), stashed)
+
+    def __call__(self):
+        state = self.load_state()
+        inputs_key = hash_files(self.input_paths()) + "|" + self.new_id
+        pdf_path = self.doc_path("pdf")
+        if (
+            state.get("inputs") == inputs_key
+            and state.get("pdf") == hash_files([pdf_path])
+        ):
+            print("{} is up to date".format(pdf_path))
+            return
+
+        self.stash(restore=True)
+        fixed_point_paths = [
+            self.doc_path(extension) for extension in FIXED_POINT_EXTENSIONS
+        ]
+        for _ in range(MAX_LATEX_PASSES):
+            before = hash_files(fixed_point_paths)
+            self.run("pdflatex", self.base)
+            bibtex_key = self.bibtex_key()
+            ran_bibtex = False
+            if (
+                not os.path.exists(self.doc_path("bbl"))
+                or state.get("bibtex") != bibtex_key
+            ):
+                self.run("bibtex", self.base)
+                state["bibtex"] = bibtex_key
+                ran_bibtex = True
+            if not ran_bibtex and hash_files(fixed_point_paths) == before:
+                break
+        else:
+            print("Warning: {} did not reach a fixed point".format(pdf_path))
+
+        self.stash()
+        remove = Remove(os.path.join(self.doc_dir, self.base), self.extensions)
+        remove()
+        modify_id = get_path("scripts", "modify_pdf_id.py")
+        path = os.path.join(self.doc_dir, self.base)
+        self.run(
+            sys.executable,
+            modify_id,
+            "--base",
+            path,
+            "--id",
+            self.new_id,
+            "--in-place",
+        )
 
-    path = get_path("doc", base)
-    remove = Remove(path, extensions)
-    session.run(remove)
-    session.run("python", modify_id, "--base", path, "--id", new_id)
+        state["inputs"] = inputs_key
+        state["pdf"] = hash_files([pdf_path])
+        self.save_state(state)
+
+
+def build_tex_file(session, base, new_id, extensions=()):
+    build = BuildTex(get_path("doc"), base, new_id, extensions=extensions)
+    session.run(build)
 
 
 @nox.session
@@ -72,8 +209,6 @@ def build_tex(session):
     # No need to create a virtualenv.
     session.virtualenv = False
 
-    session.chdir(get_path("doc"))
-
     build_tex_file(
         session,
         "curious-case",
@@ -87,7 +222,7 @@ def make_images(session):
     session.interpreter = SINGLE_INTERP
     # Install all dependencies.
     session.install("--requirement", "make-images-requirements.txt")
-    # Run the script(s).
+    # Run the script.
     # Make sure
     # - Custom ``matplotlibrc`` is used
     # - Code in ``src/`` is importable
@@ -97,14 +232,34 @@ def make_images(session):
         "PYTHONPATH": get_path("src"),
         "SOURCE_DATE_EPOCH": "0",
     }
-    names = (
-        "dp15.py",
-        "curbed_errors.py",
-        "curious_intro.py",
-    )
-    for name in names:
-        script = get_path("scripts", name)
-        session.run("python", script, env=env)
+    # Build every figure in one process (see ``scripts/make_images.py``).
+    script = get_path("scripts", "make_images.py")
+    session.run("python", script, env=env)
+
+
+@nox.session
+def compute_data(session):
+    session.interpreter = SINGLE_INTERP
+    # Install all dependencies.
+    session.install("--requirement", "make-images-requirements.txt")
+    # Compute the data for every figure (without plotting), passing along
+    # any arguments, e.g.
+    #     nox -s compute_data -- --force
+    env = {"PYTHONPATH": get_path("src")}
+    script = get_path("scripts", "compute_data.py")
+    session.run("python", script, *session.posargs, env=env)
+
+
+@nox.session
+def benchmark(session):
+    session.interpreter = SINGLE_INTERP
+    # Install all dependencies.
+    session.install("--requirement", "make-images-requirements.txt")
+    # Run the benchmarks, passing along any arguments, e.g.
+    #     nox -s benchmark -- --output new.json --compare old.json
+    env = {"PYTHONPATH": get_path("src")}
+    script = get_path("scripts", "benchmark.py")
+    session.run("python", script, *session.posargs, env=env)
 
 
 @nox.session
@@ -0,0 +1,587 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the evaluators across degree and precision.
+
+Each evaluator is timed on float, exact and batch (NumPy) inputs for
+the polynomials used in the paper and for synthetic polynomials of
+increasing degree. The largest relative error of the (float)
+evaluators is also reported, to show the trade-off between speed and
+accuracy. Results are written as JSON and can be compared against a
+previous run to detect regressions.
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import fractions
+import functools
+import json
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+import closed_form
+import compensated
+import de_casteljau
+import dp15
+import dyadic
+import power_basis
+import roots
+import utils
+import vs_method
+
+
+F = fractions.Fraction
+FORMAT_VERSION = 1
+NUM_POINTS = 8
+NUM_BATCH_POINTS = 4096
+SYNTHETIC_DEGREES = (10, 100, 1000, 10000)
+# The binomial coefficients (and so the VS method) are only exact in
+# floating point up to degree 56, so those are timed on their own ladder
+# of degrees.
+BINOMIAL_DEGREES = (5, 10, 20, 30, 40, 50, 56)
+# Estimated number of (floating point) operations allowed per case.
+DEFAULT_MAX_WORK = 5e6
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_THRESHOLD = 1.25
+
+# ``order`` is the power of the degree in the cost of one evaluation
+# and ``weight`` is the (rough) cost relative to a float operation. For
+# exact inputs the weight is also multiplied by the degree, to account
+# for the growth of the integers involved.
+Evaluator = collections.namedtuple(
+    "Evaluator", ["name", "kind", "func", "order", "weight"]
+)
+EVALUATORS = (
+    Evaluator("de_casteljau.basic", "float", de_casteljau.basic, 2, 1),
+    Evaluator("vs_method.basic", "float", vs_method.basic, 1, 1),
+    Evaluator("vs_method.cached", "float", vs_method.cached, 1, 1),
+    Evaluator("compensated.basic", "float", compensated.basic, 2, 20),
+    Evaluator("de_casteljau.basic", "exact", de_casteljau.basic, 2, 20),
+    Evaluator("dyadic.de_casteljau", "exact", dyadic.de_casteljau, 2, 1),
+    Evaluator("dyadic.vs_method", "exact", dyadic.vs_method, 1, 1),
+    Evaluator(
+        "de_casteljau.evaluate_many",
+        "batch",
+        de_casteljau.evaluate_many,
+        2,
+        0.01,
+    ),
+    Evaluator(
+        "vs_method.evaluate_many", "batch", vs_method.evaluate_many, 1, 0.01
+    ),
+    Evaluator(
+        "compensated.evaluate_many",
+        "batch",
+        compensated.evaluate_many,
+        2,
+        0.2,
+    ),
+    Evaluator("power_basis.basic", "float", power_basis.basic, 1, 1),
+    Evaluator(
+        "power_basis.evaluate_many",
+        "batch",
+        power_basis.evaluate_many,
+        1,
+        0.01,
+    ),
+)
+# Evaluators that use the binomial coefficients (so are also timed on
+# the ``BINOMIAL_DEGREES`` ladder).
+VS_EVALUATORS = tuple(
+    evaluator
+    for evaluator in EVALUATORS
+    if evaluator.name.startswith("vs_method.")
+    or evaluator.name == "dyadic.vs_method"
+)
+# Evaluators compared for accuracy (against the exact value).
+ACCURACY_EVALUATORS = (
+    ("de_casteljau.basic", de_casteljau.basic),
+    ("vs_method.basic", vs_method.basic),
+    ("power_basis.basic", power_basis.basic),
+    (
+        "power_basis.basic(exact=True)",
+        functools.partial(power_basis.basic, exact=True),
+    ),
+)
+ACCURACY_MAX_DEGREE = 1000
+# Polynomials (given by their roots) whose roots are isolated, both with
+# exact and with float coefficients. Close roots are a regression case:
+# exact isolation used to stall on them as the clip points grew.
+ROOT_CASES = (
+    ("WILKINSON1", tuple(F(j, 20) for j in range(1, 20 + 1))),
+    ("CLOSE_ROOTS", (F(1, 3), F(1, 3) + F(1, 10 ** 5), F(2, 3))),
+)
+# Polynomials (given by their roots) and starting points for Newton's
+# method. Each start must either converge to a root or fail loudly. The
+# third case is a regression case: the iterates run far away and then
+# shrink steadily, which looks like a triple root.
+NEWTON_CASES = (
+    ("MULTIPLE_ROOT", (F(1, 2),) * 20, (0.01, 0.26, 0.51, 0.6, 0.9)),
+    (
+        "WILKINSON1",
+        tuple(F(j, 20) for j in range(1, 20 + 1)),
+        tuple(j / 100 for j in range(1, 100, 7)),
+    ),
+    (
+        "THREE_ROOTS",
+        (F(82, 1000), F(345, 1000), F(76, 100)),
+        (0.22502784272288479, 0.5, 0.9),
+    ),
+)
+# Newton's method must land this close to a root (when it converges).
+NEWTON_MAX_DISTANCE = 0.5 ** 7
+
+
+def get_polynomials():
+    """Get the (named) polynomials to benchmark against."""
+    polynomials = [
+        ("WILKINSON1", dp15.WILKINSON1),
+        ("WILKINSON2", dp15.WILKINSON2),
+        ("MULTIPLE_ROOT", dp15.MULTIPLE_ROOT),
+    ]
+    for k in (3, 4, 5):
+        name = "CURBED{}".format(k + 1)
+        polynomials.append((name, tuple((-k) ** j for j in range(5 + 1))))
+
+    rng = random.Random(1806)
+    for degree in SYNTHETIC_DEGREES:
+        coeffs = tuple(rng.uniform(-1.0, 1.0) for _ in range(degree + 1))
+        polynomials.append(("SYNTHETIC{}".format(degree), coeffs))
+
+    return polynomials
+
+
+def get_binomial_polynomials():
+    """Get synthetic polynomials for the degrees in the binomial ladder."""
+    rng = random.Random(1806)
+    polynomials = []
+    for degree in BINOMIAL_DEGREES:
+        coeffs = tuple(rng.uniform(-1.0, 1.0) for _ in range(degree + 1))
+        polynomials.append(("BINOMIAL{}".format(degree), coeffs))
+
+    return polynomials
+
+
+def get_points(num_points):
+    return [(2 * i + 1) / (2.0 * num_points) for i in range(num_points)]
+
+
+def estimate_work(evaluator, degree, num_points):
+    if evaluator.order == 2:
+        work = degree * (degree + 1) // 2
+    else:
+        work = degree + 1
+    work *= evaluator.weight
+    if evaluator.kind == "exact":
+        work *= max(degree, 1)
+    return work * num_points
+
+
+def time_call(func, min_time):
+    """Time ``func()`` until at least ``min_time`` seconds have passed.
+
+    Returns the best time per call and the number of calls made.
+    """
+    best = float("inf")
+    calls = 0
+    total = 0.0
+    while total < min_time or calls == 0:
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+        best = min(best, duration)
+        total += duration
+        calls += 1
+
+    return best, calls
+
+
+def get_num_points(evaluator, degree, max_work):
+    """Get the number of points to time ``evaluator`` on.
+
+    At large degree fewer points are used, so that the case stays within
+    ``max_work``. Returns 0 if even a single point exceeds it.
+    """
+    if evaluator.kind == "batch":
+        num_points = NUM_BATCH_POINTS
+    else:
+        num_points = NUM_POINTS
+    per_point = estimate_work(evaluator, degree, 1)
+    return min(num_points, int(max_work // per_point))
+
+
+def make_case(evaluator, coeffs, num_points):
+    """Make a callable that runs ``evaluator`` over all of its points."""
+    if evaluator.kind == "batch":
+        s_vals = np.array(get_points(num_points))
+        return lambda: evaluator.func(s_vals, coeffs)
+
+    s_vals = get_points(num_points)
+    if evaluator.func is de_casteljau.basic and evaluator.kind == "exact":
+        coeffs = tuple(map(F, coeffs))
+        s_vals = list(map(F, s_vals))
+
+    def case():
+        for s in s_vals:
+            evaluator.func(s, coeffs)
+
+    return case
+
+
+def run_evaluators(polynomials, max_work, min_time, evaluators=EVALUATORS):
+    results = []
+    for poly_name, coeffs in polynomials:
+        degree = len(coeffs) - 1
+        for evaluator in evaluators:
+            num_points = get_num_points(evaluator, degree, max_work)
+            result = collections.OrderedDict(
+                [
+                    ("evaluator", evaluator.name),
+                    ("input", evaluator.kind),
+                    ("polynomial", poly_name),
+                    ("degree", degree),
+                    ("points", num_points),
+                ]
+            )
+            if num_points == 0:
+                result["skipped"] = "exceeds --max-work"
+            else:
+                case = make_case(evaluator, coeffs, num_points)
+                try:
+                    seconds, calls = time_call(case, min_time)
+                except ValueError as exc:
+                    result["error"] = str(exc)
+                else:
+                    result["seconds"] = seconds
+                    result["seconds_per_point"] = seconds / num_points
+                    result["calls"] = calls
+            results.append(result)
+            print_result(result)
+
+    return results
+
+
+def run_binomials(degrees, min_time):
+    results = []
+    for degree in degrees:
+        cases = (
+            (
+                "utils.binomial",
+                lambda: [utils.binomial(degree, k) for k in range(degree + 1)],
+            ),
+            # NOTE: This bypasses the cache to time the computation.
+            (
+                "utils.binomial_row",
+                lambda: utils.binomial_row.__wrapped__(degree),
+            ),
+        )
+        for name, case in cases:
+            result = collections.OrderedDict(
+                [
+                    ("evaluator", name),
+                    ("input", "exact"),
+                    ("polynomial", "ROW"),
+                    ("degree", degree),
+                    ("points", 1),
+                ]
+            )
+            try:
+                seconds, calls = time_call(case, min_time)
+            except ValueError as exc:
+                result["error"] = str(exc)
+            else:
+                result["seconds"] = seconds
+                result["seconds_per_point"] = seconds
+                result["calls"] = calls
+            results.append(result)
+            print_result(result)
+
+    return results
+
+
+def check_roots(found, known_roots):
+    """Check that every known root is in one of the ``found`` intervals."""
+    for root in known_roots:
+        if not any(
+            interval.start <= root <= interval.end for interval in found
+        ):
+            raise ValueError("Root not isolated", float(root))
+
+
+def run_roots(min_time):
+    """Time root isolation (and check that every root is isolated)."""
+    results = []
+    for poly_name, known_roots in ROOT_CASES:
+        exact_coeffs = closed_form.Polynomial.from_roots(known_roots).coeffs
+        degree = len(exact_coeffs) - 1
+        for kind in ("exact", "float"):
+            coeffs = exact_coeffs
+            if kind == "float":
+                coeffs = tuple(map(float, exact_coeffs))
+            result = collections.OrderedDict(
+                [
+                    ("evaluator", "roots.isolate"),
+                    ("input", kind),
+                    ("polynomial", poly_name),
+                    ("degree", degree),
+                    ("points", len(known_roots)),
+                ]
+            )
+            try:
+                found, subdivisions = roots.isolate(coeffs)
+                check_roots(found, known_roots)
+                seconds, calls = time_call(
+                    lambda: roots.isolate(coeffs), min_time
+                )
+            except ValueError as exc:
+                result["error"] = str(exc)
+            else:
+                result["seconds"] = seconds
+                result["seconds_per_point"] = seconds / len(known_roots)
+                result["calls"] = calls
+                result["subdivisions"] = subdivisions
+            results.append(result)
+            print_result(result)
+
+    return results
+
+
+def newton_all(starts, coeffs):
+    """Run Newton's method from every start.
+
+    Returns the roots found (:data:`None` where it failed to converge).
+    """
+    found = []
+    for s in starts:
+        try:
+            root, _ = roots.newton(s, coeffs)
+        except ValueError:
+            root = None
+        found.append(root)
+    return found
+
+
+def run_newton(min_time):
+    """Time Newton's method (and check that it never finds a non-root)."""
+    results = []
+    for poly_name, known_roots, starts in NEWTON_CASES:
+        exact_coeffs = closed_form.Polynomial.from_roots(known_roots).coeffs
+        coeffs = tuple(map(float, exact_coeffs))
+        result = collections.OrderedDict(
+            [
+                ("evaluator", "roots.newton"),
+                ("input", "float"),
+                ("polynomial", poly_name),
+                ("degree", len(coeffs) - 1),
+                ("points", len(starts)),
+            ]
+        )
+        found = newton_all(starts, coeffs)
+        wrong = [
+            root
+            for root in found
+            if root is not None
+            and min(abs(root - known) for known in known_roots)
+            > NEWTON_MAX_DISTANCE
+        ]
+        if wrong:
+            result["error"] = "Not a root: {}".format(wrong[0])
+        else:
+            seconds, calls = time_call(
+                lambda: newton_all(starts, coeffs), min_time
+            )
+            result["seconds"] = seconds
+            result["seconds_per_point"] = seconds / len(starts)
+            result["calls"] = calls
+            result["converged"] = sum(root is not None for root in found)
+        results.append(result)
+        print_result(result)
+
+    return results
+
+
+def run_accuracy(polynomials):
+    """Compute the largest relative error of each evaluator.
+
+    The exact values are computed with :func:`dyadic.vs_method` and
+    points where the exact value is zero are ignored.
+    """
+    results = []
+    s_vals = get_points(NUM_POINTS)
+    for poly_name, coeffs in polynomials:
+        degree = len(coeffs) - 1
+        if degree > ACCURACY_MAX_DEGREE:
+            continue
+        exact_vals = [dyadic.vs_method(s, coeffs) for s in s_vals]
+        for name, func in ACCURACY_EVALUATORS:
+            result = collections.OrderedDict(
+                [
+                    ("evaluator", name),
+                    ("input", "float"),
+                    ("polynomial", poly_name),
+                    ("degree", degree),
+                ]
+            )
+            try:
+                errors = [
+                    abs((F(func(s, coeffs)) - exact_val) / exact_val)
+                    for s, exact_val in zip(s_vals, exact_vals)
+                    if exact_val != 0
+                ]
+            except ValueError as exc:
+                result["error"] = str(exc)
+            else:
+                result["max_relative_error"] = float(max(errors, default=0))
+            results.append(result)
+            print_accuracy(result)
+
+    return results
+
+
+def print_accuracy(result):
+    name = "{:30} {:14} {:6d}".format(
+        result["evaluator"], result["polynomial"], result["degree"]
+    )
+    if "error" in result:
+        print("{} error: {}".format(name, result["error"]))
+    else:
+        print("{} {:.3e}".format(name, result["max_relative_error"]))
+
+
+def result_key(result):
+    return (
+        result["evaluator"],
+        result["input"],
+        result["polynomial"],
+        result["degree"],
+    )
+
+
+def print_result(result):
+    name = "{:28} {:5} {:14} {:6d}".format(*result_key(result))
+    if "seconds" in result:
+        print("{} {:.3e} s/point".format(name, result["seconds_per_point"]))
+    elif "error" in result:
+        print("{} error: {}".format(name, result["error"]))
+    else:
+        print("{} skipped".format(name))
+
+
+def compare(baseline_path, results, threshold):
+    """Compare results against a previous run.
+
+    Returns the number of cases slower than ``threshold`` times the
+    baseline.
+    """
+    with open(baseline_path, "r") as file_obj:
+        baseline = json.load(file_obj)
+    previous = {
+        result_key(result): result
+        for result in baseline["results"]
+        if "seconds" in result
+    }
+
+    regressions = 0
+    for result in results:
+        before = previous.get(result_key(result))
+        if before is None or "seconds" not in result:
+            continue
+        # NOTE: The number of points may differ between runs (it depends
+        #       on ``--max-work``), so the time per point is compared.
+        ratio = result["seconds_per_point"] / before["seconds_per_point"]
+        marker = ""
+        if ratio > threshold:
+            marker = "  <-- REGRESSION"
+            regressions += 1
+        name = "{:28} {:5} {:14} {:6d}".format(*result_key(result))
+        print("{} {:6.2f}x{}".format(name, ratio, marker))
+
+    return regressions
+
+
+def main():
+    description = "Benchmark the polynomial evaluators."
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--output", help="Path for the JSON results (optional)."
+    )
+    parser.add_argument(
+        "--compare", help="JSON results from a previous run to compare to."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slowdown ratio treated as a regression.",
+    )
+    parser.add_argument(
+        "--max-work",
+        type=float,
+        default=DEFAULT_MAX_WORK,
+        help=(
+            "Use fewer points (or skip) when a case is estimated to need "
+            "more operations than this."
+        ),
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        help="Minimum time (in seconds) spent timing each case.",
+    )
+    args = parser.parse_args()
+
+    polynomials = get_polynomials()
+    results = run_evaluators(polynomials, args.max_work, args.min_time)
+    results.extend(
+        run_evaluators(
+            get_binomial_polynomials(),
+            args.max_work,
+            args.min_time,
+            evaluators=VS_EVALUATORS,
+        )
+    )
+    results.extend(run_binomials(BINOMIAL_DEGREES, args.min_time))
+    results.extend(run_roots(args.min_time))
+    results.extend(run_newton(args.min_time))
+    accuracy = run_accuracy(polynomials)
+
+    info = collections.OrderedDict(
+        [
+            ("version", FORMAT_VERSION),
+            ("python", platform.python_version()),
+            ("numpy", np.__version__),
+            ("machine", platform.machine()),
+            ("results", results),
+            ("accuracy", accuracy),
+        ]
+    )
+    if args.output is not None:
+        with open(args.output, "w") as file_obj:
+            json.dump(info, file_obj, indent=2)
+            file_obj.write("\n")
+        print("Saved {}".format(args.output))
+
+    if args.compare is not None:
+        regressions = compare(args.compare, results, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
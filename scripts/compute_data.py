@@ -0,0 +1,106 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compute the data series for every figure (without plotting).
+
+The data for each figure is written to an NPZ artifact (see
+:mod:`artifacts`) and is only recomputed when the source files that
+produce it have changed. No plotting library is imported.
+
+With ``--instrument``, every artifact is recomputed serially and the
+operation counts, rational growth and timings are reported (see
+:mod:`instrument`).
+"""
+
+import argparse
+import functools
+import importlib
+import multiprocessing
+
+import artifacts
+import instrument
+import sweep
+
+
+# The script (module) that computes the data for each figure.
+NAMES = ("dp15", "curbed_errors", "curious_intro")
+
+
+def get_key(name):
+    module = importlib.import_module(name)
+    return artifacts.make_key(name, artifacts.source_paths(module.__file__))
+
+
+def compute(name, processes=None):
+    """Compute the data series for the figure built by the ``name`` script."""
+    module = importlib.import_module(name)
+    if multiprocessing.current_process().daemon:
+        # NOTE: Pool workers are daemonic, so they can't start a pool of
+        #       their own.
+        processes = 1
+    with instrument.timer(name):
+        return module.compute(processes=processes)
+
+
+def update(names=NAMES, force=False, processes=None):
+    """Make sure the artifacts for ``names`` are up to date.
+
+    The stale artifacts are computed in parallel (one task per figure,
+    see :func:`sweep.run`), unless ``processes`` is 1.
+    """
+    keys = {name: get_key(name) for name in names}
+    stale = [
+        name
+        for name in names
+        if force or not artifacts.is_current(name, keys[name])
+    ]
+    for name in names:
+        if name not in stale:
+            print("Up to date: {}".format(artifacts.get_path(name)))
+
+    all_series = sweep.run(
+        functools.partial(compute, processes=processes),
+        stale,
+        processes=processes,
+    )
+    for name, series in zip(stale, all_series):
+        artifacts.store(name, keys[name], series)
+        print("Saved {}".format(artifacts.get_path(name)))
+
+
+def main():
+    description = "Compute the data series for every figure."
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Recompute even if the artifacts are up to date.",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help=(
+            "Recompute every artifact serially and report operation "
+            "counts and timings."
+        ),
+    )
+    args = parser.parse_args()
+    if args.instrument:
+        with instrument.enabled() as counters:
+            update(force=True, processes=1)
+        print(counters.format())
+    else:
+        update(force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,86 +12,67 @@
 
 import fractions
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 import de_casteljau
+import exact_cache
+import families
+import sweep
 import utils
 
 
 F = fractions.Fraction
-GAMMA3 = utils.gamma(3)
 ALPHA = 0.5
 
 
-def custom_de_casteljau(s, n):
-    """Evaluate :math:`(1 - 5s)^n` in a "special" way.
-
-    Does so via ``p{n} = 1``, ``p{k} = (1 - s) p{k+1} - 4s p{k + 1}``.
-    """
-    p = 1
-    r = 1 - s
-    scaled = 4 * s
-    for _ in range(n):
-        p = r * p - scaled * p
-    return p
-
-
-def abs_phi(s):
-    s = F(s)
-    return abs((1 + 3 * s) / (1 - 5 * s))
-
-
+@exact_cache.memoize("curbed_errors.bounds_curbed")
 def bounds_curbed(s, n):
-    phi = abs_phi(s)
-    bound1 = utils.gamma(3 * n) * phi ** n
-    bound2 = (1 + phi * GAMMA3) ** n - 1
-    if bound1 <= 0:
-        raise ValueError(bound1, float(bound1))
-    if bound2 <= 0:
-        raise ValueError(bound2, float(bound2))
+    return families.bounds_curbed(s, 4, n)
 
-    computed_p = custom_de_casteljau(s, n)
-    exact_p = custom_de_casteljau(F(s), n)
-    if not isinstance(exact_p, F):
-        raise TypeError(exact_p)
-    observed_err = abs((computed_p - exact_p) / exact_p)
 
-    return float(bound1), float(bound2), float(observed_err)
+def compute_row(exponent):
+    N = 2.1 ** exponent
+    bN = families.get_point(4, F(N))
+    bound1, bound2, observed_err = bounds_curbed(float(bN), 5)
+    return N, bound1, bound2, observed_err
 
 
-def main(filename=None):
-    bound_vals = []
+def compute(processes=None):
+    """Compute the data series (bounds and observed errors vs. :math:`N`)."""
+    bound_vals = sweep.run(compute_row, range(1, 45 + 1), processes=processes)
+    bound_vals = np.array(bound_vals)
+    return {
+        "N": bound_vals[:, 0],
+        "naive_bound": bound_vals[:, 1],
+        "improved_bound": bound_vals[:, 2],
+        "observed_error": bound_vals[:, 3],
+    }
 
-    for exponent in range(1, 45 + 1):
-        N = 2.1 ** exponent
-        bN = F(1, 5) + F(8, 25 * F(N))
-        bound1, bound2, observed_err = bounds_curbed(float(bN), 5)
-        bound_vals.append((N, bound1, bound2, observed_err))
 
-    bound_vals = np.array(bound_vals)
+def render(series, filename=None):
+    import matplotlib.pyplot as plt
 
     figure = plt.figure()
     ax = figure.gca()
     # Add the "curbed" plot.
     ax.loglog(
-        bound_vals[:, 0],
-        bound_vals[:, 1],
+        series["N"],
+        series["naive_bound"],
         color="black",
         alpha=ALPHA,
         linestyle=":",
         label=r"Na\"ive Bound",
     )
     ax.loglog(
-        bound_vals[:, 0],
-        bound_vals[:, 2],
+        series["N"],
+        series["improved_bound"],
         color="black",
         alpha=ALPHA,
         label="Improved Bound",
     )
     ax.loglog(
-        bound_vals[:, 0],
-        bound_vals[:, 3],
+        series["N"],
+        series["observed_error"],
         marker="o",
         linestyle="none",
         markersize=5,
@@ -114,6 +95,10 @@ def main(filename=None):
         plt.close(figure)
 
 
+def main(filename=None):
+    render(compute(), filename=filename)
+
+
 if __name__ == "__main__":
     utils.set_styles()
     main(filename="curbed_condition.pdf")
@@ -12,18 +12,19 @@
 
 import fractions
 
-import matplotlib.pyplot as plt
 import numpy as np
 
-import de_casteljau
+import exact_cache
+import families
+import sweep
 import utils
 
 
 F = fractions.Fraction
-GAMMA15 = utils.gamma(15)
 ALPHA = 0.5
 
 
+@exact_cache.memoize("curious_intro.bound4")
 def bound4(N):
     r"""Compute an a priori error bound.
 
@@ -33,22 +34,15 @@ def bound4(N):
 
     Evaluations at the point :math:`s = a_N = 1/4 + 6/(16N)`.
     """
-    aN = F(1, 4) + F(6, 16 * N)
-    p_exact = (1 - 4 * aN) ** 5
-    ptilde_exact = (1 + 2 * aN) ** 5
-    bound = GAMMA15 * ptilde_exact / p_exact
-    return float(abs(bound))
+    return families.bound(3, 5, N)
 
 
+@exact_cache.memoize("curious_intro.error4")
 def error4(N):
-    aN = F(1, 4) + F(6, 16 * N)
-    coeffs = (1, -3, 9, -27, 81, -243)
-    p_exact = de_casteljau.basic(aN, coeffs)
-    p_computed = de_casteljau.basic(float(aN), coeffs)
-    err_exact = abs((F(p_computed) - p_exact) / p_exact)
-    return float(err_exact)
+    return families.error(3, 5, N)
 
 
+@exact_cache.memoize("curious_intro.bound5")
 def bound5(N):
     r"""Compute an a priori error bound.
 
@@ -58,22 +52,15 @@ def bound5(N):
 
     Evaluations at the point :math:`s = b_N = 1/5 + 8/(25N)`.
     """
-    bN = F(1, 5) + F(8, 25 * N)
-    p_exact = (1 - 5 * bN) ** 5
-    ptilde_exact = (1 + 3 * bN) ** 5
-    bound = GAMMA15 * ptilde_exact / p_exact
-    return float(abs(bound))
+    return families.bound(4, 5, N)
 
 
+@exact_cache.memoize("curious_intro.error5")
 def error5(N):
-    bN = F(1, 5) + F(8, 25 * N)
-    coeffs = (1, -4, 16, -64, 256, -1024)
-    p_exact = de_casteljau.basic(bN, coeffs)
-    p_computed = de_casteljau.basic(float(bN), coeffs)
-    err_exact = abs((F(p_computed) - p_exact) / p_exact)
-    return float(err_exact)
+    return families.error(4, 5, N)
 
 
+@exact_cache.memoize("curious_intro.bound6")
 def bound6(N):
     r"""Compute an a priori error bound.
 
@@ -83,51 +70,54 @@ def bound6(N):
 
     Evaluations at the point :math:`s = c_N = 1/6 + 10/(36N)`.
     """
-    cN = F(1, 6) + F(10, 36 * N)
-    p_exact = (1 - 6 * cN) ** 5
-    ptilde_exact = (1 + 4 * cN) ** 5
-    bound = GAMMA15 * ptilde_exact / p_exact
-    return float(abs(bound))
+    return families.bound(5, 5, N)
 
 
+@exact_cache.memoize("curious_intro.error6")
 def error6(N):
-    cN = F(1, 6) + F(10, 36 * N)
-    coeffs = (1, -5, 25, -125, 625, -3125)
-    p_exact = de_casteljau.basic(cN, coeffs)
-    p_computed = de_casteljau.basic(float(cN), coeffs)
-    err_exact = abs((F(p_computed) - p_exact) / p_exact)
-    return float(err_exact)
+    return families.error(5, 5, N)
+
+
+def compute_row(exponent):
+    N = 2.1 ** exponent
+    fN = F(N)
+    return (
+        N,
+        bound4(fN),
+        bound5(fN),
+        bound6(fN),
+        error4(fN),
+        error5(fN),
+        error6(fN),
+    )
 
 
-def main(filename=None):
+def compute(processes=None):
+    """Compute the data series (bounds and observed errors vs. :math:`N`)."""
+    bounds = sweep.run(compute_row, range(1, 45 + 1), processes=processes)
+    bounds = np.array(bounds)
+    names = ("N", "bound4", "bound5", "bound6", "error4", "error5", "error6")
+    return {name: bounds[:, index] for index, name in enumerate(names)}
+
+
+def render(series, filename=None):
+    import matplotlib.pyplot as plt
+
     figure = plt.figure()
     ax = figure.gca()
 
-    bounds = []
-    for exponent in range(1, 45 + 1):
-        N = 2.1 ** exponent
-        fN = F(N)
-        bounds.append(
-            (
-                N,
-                bound4(fN),
-                bound5(fN),
-                bound6(fN),
-                error4(fN),
-                error5(fN),
-                error6(fN),
-            )
-        )
-
-    bounds = np.array(bounds)
     ax.loglog(
-        bounds[:, 0], bounds[:, 1], alpha=ALPHA, color="black", label="Bound"
+        series["N"],
+        series["bound4"],
+        alpha=ALPHA,
+        color="black",
+        label="Bound",
     )
     # NOTE: We intentionally omit bound5() and bound6() since they are
     #       essentially identical.
     ax.loglog(
-        bounds[:, 0],
-        bounds[:, 4],
+        series["N"],
+        series["error4"],
         marker="o",
         linestyle="none",
         markersize=7,
@@ -136,15 +126,15 @@ def main(filename=None):
         label="$u(s)$",
     )
     ax.loglog(
-        bounds[:, 0],
-        bounds[:, 5],
+        series["N"],
+        series["error5"],
         marker="d",
         linestyle="none",
         label="$v(s)$",
     )
     ax.loglog(
-        bounds[:, 0],
-        bounds[:, 6],
+        series["N"],
+        series["error6"],
         marker="o",
         linestyle="none",
         markersize=4,
@@ -170,6 +160,10 @@ def main(filename=None):
         plt.close(figure)
 
 
+def main(filename=None):
+    render(compute(), filename=filename)
+
+
 if __name__ == "__main__":
     utils.set_styles()
     main(filename="against_a_priori.pdf")
@@ -12,14 +12,21 @@
 
 import fractions
 
-import matplotlib.pyplot as plt
+import numpy as np
 
+import closed_form
 import de_casteljau
+import dyadic
+import exact_cache
+import sweep
 import vs_method
 import utils
 
 
 F = fractions.Fraction
+exact_de_casteljau = exact_cache.memoize("dyadic.de_casteljau")(
+    dyadic.de_casteljau
+)
 # f(s) = (s - 1/20)(s - 2/20) ... (s - 19/20)(s - 20/20)
 WILKINSON1 = (
     float.fromhex("0x1.8e9b4e661311ep-26"),
@@ -92,32 +99,84 @@ MULTIPLE_ROOT = (
     -0.5 ** 20,
     0.5 ** 20,
 )
+# NOTE: The rounded coefficients of ``f(s)`` and ``g(s)`` do not match
+#       their factored forms exactly, so only ``h(s)`` has a usable
+#       closed form.
+CLOSED_FORMS = {
+    polynomial.coeffs: polynomial
+    for polynomial in (
+        closed_form.Polynomial.from_roots(
+            [F(j, 20) for j in range(1, 20 + 1)], coeffs=WILKINSON1
+        ),
+        closed_form.Polynomial.from_roots(
+            [F(2, 2 ** j) for j in range(1, 20 + 1)], coeffs=WILKINSON2
+        ),
+        closed_form.Polynomial.from_power(
+            F(-1, 2), 1, 20, coeffs=MULTIPLE_ROOT
+        ),
+    )
+    if polynomial.closed_form
+}
+
+
+def exact_value(s, coeffs):
+    """Evaluate exactly, via the closed form if there is one."""
+    polynomial = CLOSED_FORMS.get(coeffs)
+    if polynomial is None:
+        return exact_de_casteljau(s, coeffs)
+
+    return polynomial.exact(s)
+
 
+def compute_errors(s, coeffs):
+    """Compute the a priori bound and observed errors at a point.
 
-def do_plot(ax, s_vals, coeffs, title, add_legend=False, add_ylabel=False):
-    bounds = []
-    rel_errors1 = []
-    rel_errors2 = []
+    Returns a triple of the bound and the relative errors for
+    de Casteljau and the VS method.
+    """
     n = len(coeffs) - 1
     gamma3n = utils.gamma(3 * n)
-    exact_coeffs = tuple(map(F, coeffs))
-    abs_coeffs = tuple(map(abs, exact_coeffs))
+    abs_coeffs = tuple(map(abs, coeffs))
 
-    for s in s_vals:
-        exact_s = F(s)
-        exact_p = de_casteljau.basic(exact_s, exact_coeffs)
-        if not isinstance(exact_p, F):
-            raise TypeError(exact_p)
+    exact_p = exact_value(s, coeffs)
+    if not isinstance(exact_p, F):
+        raise TypeError(exact_p)
 
-        exact_p_tilde = de_casteljau.basic(exact_s, abs_coeffs)
-        a_priori_bound = gamma3n * exact_p_tilde / abs(exact_p)
-        bounds.append(float(a_priori_bound))
+    exact_p_tilde = exact_de_casteljau(s, abs_coeffs)
+    a_priori_bound = gamma3n * exact_p_tilde / abs(exact_p)
+
+    error1 = F(de_casteljau.basic(s, coeffs)) - exact_p
+    error2 = F(vs_method.basic(s, coeffs)) - exact_p
+    return (
+        float(a_priori_bound),
+        float(abs(error1 / exact_p)),
+        float(abs(error2 / exact_p)),
+    )
+
+
+def compute_panel(prefix, s_vals, coeffs, processes=None):
+    """Compute the bounds and relative errors plotted in one panel.
+
+    Returns a dictionary of data series (with names starting with
+    ``prefix``).
+    """
+    (results,) = sweep.evaluate(
+        compute_errors, s_vals, [coeffs], processes=processes
+    )
+    bounds, rel_errors1, rel_errors2 = zip(*results)
+    return {
+        prefix + "_s": np.array(s_vals),
+        prefix + "_bound": np.array(bounds),
+        prefix + "_de_casteljau": np.array(rel_errors1),
+        prefix + "_vs": np.array(rel_errors2),
+    }
 
-        error1 = F(de_casteljau.basic(s, coeffs)) - exact_p
-        rel_errors1.append(float(abs(error1 / exact_p)))
 
-        error2 = F(vs_method.basic(s, coeffs)) - exact_p
-        rel_errors2.append(float(abs(error2 / exact_p)))
+def do_plot(ax, series, prefix, title, add_legend=False, add_ylabel=False):
+    s_vals = series[prefix + "_s"]
+    bounds = series[prefix + "_bound"]
+    rel_errors1 = series[prefix + "_de_casteljau"]
+    rel_errors2 = series[prefix + "_vs"]
 
     size = 5
     ax.semilogy(
@@ -160,17 +219,26 @@ def do_plot(ax, s_vals, coeffs, title, add_legend=False, add_ylabel=False):
     ax.set_title(title, fontsize=20)
 
 
-def main(filename=None):
-    figure, (ax1, ax2, ax3) = plt.subplots(1, 3)
-
+def compute(processes=None):
+    """Compute the data series for every panel of the figure."""
     s_vals1 = [(2 * i + 1) / 72.0 for i in range(35 + 1)]
-    do_plot(
-        ax1, s_vals1, WILKINSON1, "$f(s)$", add_legend=True, add_ylabel=True
-    )
     s_vals2 = [i / 39.0 for i in range(1, 38 + 1)]
-    do_plot(ax2, s_vals2, WILKINSON2, "$g(s)$")
     s_vals3 = [4 * i / 100.0 for i in range(1, 24 + 1)]
-    do_plot(ax3, s_vals3, MULTIPLE_ROOT, "$h(s)$")
+
+    series = {}
+    series.update(compute_panel("f", s_vals1, WILKINSON1, processes))
+    series.update(compute_panel("g", s_vals2, WILKINSON2, processes))
+    series.update(compute_panel("h", s_vals3, MULTIPLE_ROOT, processes))
+    return series
+
+
+def render(series, filename=None):
+    import matplotlib.pyplot as plt
+
+    figure, (ax1, ax2, ax3) = plt.subplots(1, 3)
+    do_plot(ax1, series, "f", "$f(s)$", add_legend=True, add_ylabel=True)
+    do_plot(ax2, series, "g", "$g(s)$")
+    do_plot(ax3, series, "h", "$h(s)$")
 
     if filename is None:
         plt.show()
@@ -190,6 +258,10 @@ def main(filename=None):
         plt.close(figure)
 
 
+def main(filename=None):
+    render(compute(), filename=filename)
+
+
 if __name__ == "__main__":
     utils.set_styles()
     main(filename="compare_dp15.pdf")
@@ -0,0 +1,49 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Build every figure in a single process.
+
+The data for all of the figures is brought up to date first (in
+parallel, see :mod:`compute_data`). Then the plotting stack is imported
+(and styled) once and each figure is rendered into ``images/`` from its
+artifact.
+"""
+
+import importlib
+
+import artifacts
+import compute_data
+import utils
+
+
+# The script (module) for each figure, along with the filename it is
+# saved to.
+FIGURES = (
+    ("dp15", "compare_dp15.pdf"),
+    ("curbed_errors", "curbed_condition.pdf"),
+    ("curious_intro", "against_a_priori.pdf"),
+)
+
+
+def main():
+    names = [name for name, _ in FIGURES]
+    compute_data.update(names)
+
+    utils.set_styles()
+    for name, filename in FIGURES:
+        module = importlib.import_module(name)
+        series = artifacts.load(name)
+        module.render(series, filename=filename)
+
+
+if __name__ == "__main__":
+    main()
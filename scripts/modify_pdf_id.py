@@ -14,11 +14,16 @@
 
 This is provided to make generated manuscripts (via ``pdflatex``) be
 bitwise identical across runs.
+
+Since the new ID line has the same length as the one it replaces, the
+``--in-place`` mode memory-maps the file and only overwrites the bytes
+of the ID line (rather than rewriting the whole file).
 """
 
 from __future__ import print_function
 
 import argparse
+import mmap
 
 
 SPLIT_TEXT = b"\n/ID [<"
@@ -65,19 +70,59 @@ def do_replace(path, new_id):
     print("Updated {}".format(path))
 
 
+def do_replace_in_place(path, new_id):
+    new_id_line = ID_LINE.format(new_id).encode("ascii")
+    verify_id_snippet(new_id_line)
+
+    with open(path, "r+b") as file_obj:
+        contents = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_WRITE)
+        try:
+            # The ID is in the trailer, so search from the end (and then
+            # assert that there is exactly one match).
+            index = contents.rfind(SPLIT_TEXT)
+            if index == -1:
+                raise ValueError(path, "No ID line found")
+            if contents.find(SPLIT_TEXT) != index:
+                raise ValueError(path, "Multiple ID lines found")
+
+            start = index + len(SPLIT_TEXT)
+            end = contents.find(b"\n", start)
+            if end == -1:
+                raise ValueError(path, "ID line is not terminated")
+            verify_id_snippet(contents[start:end])
+
+            if contents[start:end] != new_id_line:
+                contents[start:end] = new_id_line
+                contents.flush()
+        finally:
+            contents.close()
+
+    print("Updated {}".format(path))
+
+
 def main():
     description = "Modify the `/ID` property in a PDF generated by `pdflatex`."
     parser = argparse.ArgumentParser(description=description)
     parser.add_argument(
-        "--base", required=True, help="Base path for PDF file to be modified."
+        "--base",
+        required=True,
+        nargs="+",
+        help="Base path(s) for PDF file(s) to be modified.",
     )
     parser.add_argument(
         "--id", dest="id_", required=True, help="The prescribed ID to add."
     )
+    parser.add_argument(
+        "--in-place",
+        action="store_true",
+        help="Only overwrite the ID line (via a memory-mapped file).",
+    )
 
     args = parser.parse_args()
-    filename = "{}.pdf".format(args.base)
-    do_replace(filename, args.id_)
+    replace = do_replace_in_place if args.in_place else do_replace
+    for base in args.base:
+        filename = "{}.pdf".format(base)
+        replace(filename, args.id_)
 
 
 if __name__ == "__main__":
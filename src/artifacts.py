@@ -0,0 +1,125 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Versioned NPZ artifacts holding the data series for each figure.
+
+Each artifact is a ``.npz`` file with one array per data series (e.g.
+the points, bounds and observed errors) along with the key it was
+computed for. The key is the SHA-256 hash of the format version, the
+name of the artifact and the contents of the source files that produce
+it (the inputs, e.g. the points, are defined in those files). An
+artifact is only recomputed when its key changes. The values memoized
+by :mod:`exact_cache` are keyed by the same source files, so they are
+never reused after the code that computes them changes.
+
+Artifacts are written to a temporary file and then renamed, so a reader
+never sees a partial artifact. They live in ``results/`` in the project
+root, unless ``RESULTS_DIR`` is set.
+
+This module must not import any plotting library.
+"""
+
+import glob
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+
+FORMAT_VERSION = 1
+RESULTS_DIR_ENV = "RESULTS_DIR"
+KEY_FIELD = "_key"
+
+
+def _root_dir():
+    curr_dir = os.path.abspath(os.path.dirname(__file__))
+    return os.path.dirname(curr_dir)
+
+
+def get_results_dir():
+    results_dir = os.environ.get(RESULTS_DIR_ENV)
+    if results_dir is None:
+        return os.path.join(_root_dir(), "results")
+
+    return results_dir
+
+
+def get_path(name):
+    return os.path.join(get_results_dir(), name + ".npz")
+
+
+def source_paths(script_path):
+    """Get the source files that an artifact depends on.
+
+    This is the script that computes it along with every module in
+    ``src/`` (any of which may be imported by the script).
+    """
+    pattern = os.path.join(_root_dir(), "src", "*.py")
+    return [os.path.abspath(script_path)] + sorted(glob.glob(pattern))
+
+
+def make_key(name, paths):
+    hasher = hashlib.sha256()
+    hasher.update("{}|{}".format(FORMAT_VERSION, name).encode("ascii"))
+    for path in paths:
+        with open(path, "rb") as file_obj:
+            contents = file_obj.read()
+        hasher.update(b"|")
+        hasher.update(hashlib.sha256(contents).digest())
+    return hasher.hexdigest()
+
+
+def load(name, key=None):
+    """Load the data series in an artifact.
+
+    Returns a dictionary of arrays, or :data:`None` if the artifact does
+    not exist or (when ``key`` is provided) was computed for a different
+    key.
+    """
+    path = get_path(name)
+    try:
+        with np.load(path) as data:
+            if key is not None and str(data[KEY_FIELD]) != key:
+                return None
+            return {
+                field: data[field]
+                for field in data.files
+                if field != KEY_FIELD
+            }
+    except (IOError, KeyError, ValueError):
+        return None
+
+
+def store(name, key, series):
+    """Store the data series (a dictionary of arrays) in an artifact."""
+    path = get_path(name)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file_obj:
+            np.savez(file_obj, **series, **{KEY_FIELD: np.array(key)})
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def is_current(name, key):
+    """Check if an artifact exists and was computed for ``key``."""
+    try:
+        with np.load(get_path(name)) as data:
+            return str(data[KEY_FIELD]) == key
+    except (IOError, KeyError, ValueError):
+        return False
@@ -0,0 +1,130 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Evaluates with (only) as much precision as needed.
+
+Each point is evaluated with a sequence of increasingly expensive
+methods, stopping at the first one that is certified to have a relative
+error of at most ``tol``:
+
+* ``"float"``: de Casteljau's method with a running error bound (see
+  :mod:`running_error`).
+* ``"compensated"``: the compensated de Casteljau method (see
+  :mod:`compensated`), which satisfies
+
+  .. math::
+
+      \left|\widehat{p}(s) - p(s)\right| \leq \mathbf{u} \left|p(s)\right|
+          + 2 \gamma_{3n}^2 \widetilde{p}(s).
+
+* ``"exact"``: exact evaluation (see :func:`dyadic.vs_method`) rounded
+  to the nearest float. This is always accepted.
+
+Only points that are badly conditioned (relative to ``tol``), e.g. near
+a root, require the more expensive methods.
+"""
+
+import numpy as np
+
+import compensated
+import de_casteljau
+import dyadic
+import running_error
+import utils
+
+
+LEVELS = ("float", "compensated", "exact")
+FLOAT, COMPENSATED, EXACT = range(len(LEVELS))
+U = 0.5 ** 53
+# Accounts for the rounding errors made when computing the bounds.
+BOUND_SLACK = 1.0 + 8 * U
+
+
+def relative_bound(value, abs_bound):
+    r"""Convert an absolute error bound into a relative one.
+
+    If :math:`|\widehat{p} - p| \leq E`, then the relative error is at
+    most :math:`E / (|\widehat{p}| - E)`. Returns ``inf`` if the bound
+    doesn't exclude :math:`p = 0`. Works for both scalars and NumPy
+    arrays.
+    """
+    margin = np.abs(value) - abs_bound
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = BOUND_SLACK * abs_bound / margin
+    return np.where(margin > 0, result, np.inf)
+
+
+def compensated_bound(value, p_tilde, degree):
+    r"""Bound the absolute error of a compensated de Casteljau value.
+
+    ``p_tilde`` is the computed value of :math:`\widetilde{p}(s)`, which
+    has a relative error of at most :math:`\gamma_{3n}` (there is no
+    cancellation). Works for both scalars and NumPy arrays.
+    """
+    gamma = float(utils.gamma(3 * degree))
+    p_tilde_max = p_tilde / (1.0 - gamma)
+    abs_bound = U * np.abs(value) + 2.0 * gamma * gamma * p_tilde_max
+    return BOUND_SLACK * abs_bound / (1.0 - U)
+
+
+def evaluate(s, coeffs, tol):
+    """Evaluate with a relative error of at most ``tol``.
+
+    Returns a pair of the value and the level (an index into
+    :data:`LEVELS`) that produced it.
+    """
+    value, abs_bound = running_error.basic(s, coeffs)
+    if relative_bound(value, abs_bound) <= tol:
+        return value, FLOAT
+
+    degree = len(coeffs) - 1
+    abs_coeffs = tuple(abs(coeff) for coeff in coeffs)
+    value = compensated.basic(s, coeffs)
+    p_tilde = de_casteljau.basic(s, abs_coeffs)
+    abs_bound = compensated_bound(value, p_tilde, degree)
+    if relative_bound(value, abs_bound) <= tol:
+        return value, COMPENSATED
+
+    return float(dyadic.vs_method(s, coeffs)), EXACT
+
+
+def evaluate_many(s_vals, coeffs, tol):
+    """Evaluate at many points with a relative error of at most ``tol``.
+
+    Every point is evaluated with the first level and each following
+    level is only used for the points that still miss ``tol``. Returns a
+    pair of arrays: the values and the levels (indices into
+    :data:`LEVELS`) that produced them.
+    """
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    flat_s = s_vals.ravel()
+    degree = len(coeffs) - 1
+
+    values, abs_bounds = running_error.evaluate_many(flat_s, coeffs)
+    levels = np.full(flat_s.shape, FLOAT, dtype=np.int8)
+    (pending,) = np.nonzero(~(relative_bound(values, abs_bounds) <= tol))
+
+    if pending.size:
+        s_pending = flat_s[pending]
+        abs_coeffs = tuple(abs(coeff) for coeff in coeffs)
+        comp_values = compensated.evaluate_many(s_pending, coeffs)
+        p_tilde = de_casteljau.evaluate_many(s_pending, abs_coeffs)
+        abs_bounds = compensated_bound(comp_values, p_tilde, degree)
+        values[pending] = comp_values
+        levels[pending] = COMPENSATED
+        pending = pending[~(relative_bound(comp_values, abs_bounds) <= tol)]
+
+    for index in pending:
+        values[index] = float(dyadic.vs_method(float(flat_s[index]), coeffs))
+        levels[index] = EXACT
+
+    return values.reshape(s_vals.shape), levels.reshape(s_vals.shape)
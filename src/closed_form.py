@@ -0,0 +1,171 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Polynomials in Bernstein form with a known closed form.
+
+Many of the polynomials studied are known in factored form
+
+.. math::
+
+    p(s) = c \prod_i \left(a_i + b_i s\right)^{m_i}
+
+(e.g. a product over the roots or a power of a single linear factor).
+Evaluating this exactly requires :math:`O(\sum_i \log m_i)` operations
+rather than the :math:`O(n^2)` operations of de Casteljau's method (or
+the :math:`O(n)` operations on ever-growing integers of the VS method).
+
+A :class:`Polynomial` holds the Bernstein coefficients along with an
+(optional) closed form. The closed form is expanded exactly in the
+Bernstein basis once, when the polynomial is created, and is only used
+if it matches the coefficients exactly. For example, coefficients that
+have been rounded to floats usually do not match the factored form of
+the polynomial they approximate; in that case exact evaluation falls
+back to the coefficients.
+
+:func:`expand` returns the coefficients in the order used by
+:mod:`de_casteljau`, i.e. ``coeffs[0]`` is the value at :math:`s = 0`.
+"""
+
+import fractions
+
+import de_casteljau
+import dyadic
+
+
+F = fractions.Fraction
+
+
+def _linear_bernstein(factor):
+    r"""Get the scaled Bernstein coefficients of :math:`(a + bs)^m`.
+
+    Since :math:`a + bs = a(1 - s) + (a + b)s`, the Bernstein
+    coefficients are :math:`a^{m - j} (a + b)^j`. These are returned
+    scaled by :math:`\binom{m}{j}`.
+    """
+    a_val, b_val, multiplicity = factor
+    end_val = a_val + b_val
+    scaled = []
+    binom_val = 1
+    for j in range(multiplicity + 1):
+        scaled.append(binom_val * a_val ** (multiplicity - j) * end_val ** j)
+        binom_val = binom_val * (multiplicity - j) // (j + 1)
+    return scaled
+
+
+def expand(factors, scale=1):
+    r"""Expand a factored polynomial into Bernstein coefficients.
+
+    ``factors`` is a sequence of ``(a, b, m)`` triples representing
+    :math:`(a + bs)^m`. The expansion is exact: the scaled coefficients
+    :math:`\binom{n}{j} p_j` of a product are the convolution of the
+    scaled coefficients of the factors.
+    """
+    scaled = [F(scale)]
+    for factor in factors:
+        factor_scaled = _linear_bernstein(factor)
+        product = [0] * (len(scaled) + len(factor_scaled) - 1)
+        for i, left in enumerate(scaled):
+            for j, right in enumerate(factor_scaled):
+                product[i + j] += left * right
+        scaled = product
+
+    degree = len(scaled) - 1
+    coeffs = []
+    binom_val = 1
+    for j, value in enumerate(scaled):
+        coeffs.append(value / binom_val)
+        binom_val = binom_val * (degree - j) // (j + 1)
+    return tuple(coeffs)
+
+
+def exact_bernstein(s, coeffs):
+    """Evaluate the polynomial with Bernstein ``coeffs`` exactly.
+
+    Uses :func:`dyadic.vs_method` when the point and coefficients are
+    dyadic rationals (e.g. floats) and :func:`de_casteljau.basic` with
+    :class:`fractions.Fraction` inputs otherwise.
+    """
+    try:
+        return dyadic.vs_method(s, coeffs)
+    except ValueError:
+        return de_casteljau.basic(F(s), tuple(map(F, coeffs)))
+
+
+class Polynomial(object):
+    """A polynomial in Bernstein form with an (optional) closed form.
+
+    ``factors`` is a sequence of ``(a, b, m)`` triples (see
+    :func:`expand`) and the closed form is ``scale`` times the product
+    of the factors. The closed form is checked against ``coeffs`` once;
+    :attr:`closed_form` is :data:`True` only if it matches exactly.
+    """
+
+    def __init__(self, coeffs, factors=None, scale=1):
+        self.coeffs = tuple(coeffs)
+        self.degree = len(self.coeffs) - 1
+        self.factors = None
+        self.scale = None
+        if factors is not None:
+            factors = tuple(
+                (F(a_val), F(b_val), multiplicity)
+                for a_val, b_val, multiplicity in factors
+            )
+            expanded = expand(factors, scale=scale)
+            if expanded == tuple(map(F, self.coeffs)):
+                self.factors = factors
+                self.scale = F(scale)
+
+    @property
+    def closed_form(self):
+        return self.factors is not None
+
+    @classmethod
+    def from_roots(cls, roots, scale=1, coeffs=None):
+        r"""Create from the roots :math:`c \prod_i (s - r_i)`.
+
+        Repeated roots should be repeated in ``roots``. If ``coeffs`` is
+        not provided, they are computed exactly from the roots.
+        """
+        factors = [(-F(root), 1, 1) for root in roots]
+        if coeffs is None:
+            coeffs = expand(factors, scale=scale)
+        return cls(coeffs, factors=factors, scale=scale)
+
+    @classmethod
+    def from_power(cls, a_val, b_val, multiplicity, scale=1, coeffs=None):
+        r"""Create from a power :math:`c (a + bs)^m`.
+
+        If ``coeffs`` is not provided, they are computed exactly.
+        """
+        factors = [(a_val, b_val, multiplicity)]
+        if coeffs is None:
+            coeffs = expand(factors, scale=scale)
+        return cls(coeffs, factors=factors, scale=scale)
+
+    def exact(self, s):
+        """Evaluate exactly at ``s``.
+
+        Returns a :class:`fractions.Fraction`. Uses the closed form if
+        it is available and :func:`exact_bernstein` otherwise.
+        """
+        if self.factors is None:
+            return F(exact_bernstein(s, self.coeffs))
+
+        s = F(s)
+        result = self.scale
+        for a_val, b_val, multiplicity in self.factors:
+            result *= (a_val + b_val * s) ** multiplicity
+        return result
+
+    def __call__(self, s):
+        """Evaluate with de Casteljau's method (e.g. in floating point)."""
+        return de_casteljau.basic(s, self.coeffs)
@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Estimates the condition number of a polynomial in Bernstein form.
+
+The condition number of evaluation at :math:`s \in \left[0, 1\right]` is
+
+.. math::
+
+    \kappa(s) = \frac{\widetilde{p}(s)}{\left|p(s)\right|}
+
+where :math:`\widetilde{p}` has coefficients
+:math:`\left|p_j\right|`. Since :math:`\widetilde{p}` has no cancellation,
+it can be computed accurately in floating point. The denominator is
+computed with :mod:`compensated`, which satisfies
+
+.. math::
+
+    \left|\widehat{p}(s) - p(s)\right| \leq \mathbf{u} \left|p(s)\right| +
+        2 \gamma_{3n}^2 \widetilde{p}(s).
+
+When the second term is not small relative to
+:math:`\left|\widehat{p}(s)\right|` (i.e. near a root), the estimate is
+flagged as unreliable.
+"""
+
+import numpy as np
+
+import compensated
+import de_casteljau
+import dyadic
+import utils
+
+
+# Largest (relative) uncertainty allowed in ``|p(s)|``.
+RTOL = 0.5 ** 10
+
+
+def estimate(s_vals, coeffs, rtol=RTOL):
+    """Estimate the condition number at many points.
+
+    Returns a pair of arrays: the estimated condition numbers and a
+    boolean mask of points where the estimate is unreliable.
+    """
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    degree = len(coeffs) - 1
+    abs_coeffs = tuple(abs(coeff) for coeff in coeffs)
+
+    p_tilde = de_casteljau.evaluate_many(s_vals, abs_coeffs)
+    abs_p = np.abs(compensated.evaluate_many(s_vals, coeffs))
+    gamma = float(utils.gamma(3 * degree))
+    uncertainty = 2.0 * gamma * gamma * p_tilde
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cond = p_tilde / abs_p
+    unreliable = ~(uncertainty < rtol * abs_p)
+    return cond, unreliable
+
+
+def exact(s, coeffs):
+    """Compute the condition number exactly (then round).
+
+    Returns ``inf`` when ``s`` is a root.
+    """
+    abs_coeffs = tuple(abs(coeff) for coeff in coeffs)
+    p_tilde = dyadic.de_casteljau(s, abs_coeffs)
+    p = dyadic.de_casteljau(s, coeffs)
+    if p == 0:
+        return np.inf
+
+    return float(p_tilde / abs(p))
+
+
+def evaluate(s_vals, coeffs, rtol=RTOL):
+    """Compute the condition number at many points.
+
+    Uses :func:`estimate` and then falls back to :func:`exact` only for
+    the points where the estimate is unreliable.
+    """
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    cond, unreliable = estimate(s_vals, coeffs, rtol=rtol)
+    flat_s = s_vals.ravel()
+    flat_cond = cond.reshape(-1)
+    for index in np.flatnonzero(unreliable):
+        flat_cond[index] = exact(float(flat_s[index]), coeffs)
+
+    return cond
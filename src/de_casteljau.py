@@ -35,6 +35,8 @@ by progressively reducing the control points
    :math:`p_n` to :math:`p_0`.
 """
 
+import numpy as np
+
 
 def basic(s, coeffs):
     """Performs the "standard" de Casteljau algorithm."""
@@ -50,3 +52,229 @@ def basic(s, coeffs):
         pk = new_pk
 
     return pk[0]
+
+
+def subdivide(s, coeffs):
+    r"""Subdivide a curve at ``s`` with de Casteljau's algorithm.
+
+    The first and last control points at each level of the reduction are
+    the control points of the two halves, so the halves are computed in
+    the same pass as the value. Returns the triple ``(left, right,
+    value)``, where ``left`` reparameterizes :math:`\left[0, s\right]`
+    and ``right`` reparameterizes :math:`\left[s, 1\right]` (both as
+    :math:`\left[0, 1\right]`). The value agrees with :func:`basic` bit
+    for bit.
+    """
+    r = 1 - s
+
+    degree = len(coeffs) - 1
+    pk = list(coeffs)
+    left = [pk[0]]
+    right = [pk[-1]]
+    for k in range(degree):
+        new_pk = []
+        for j in range(degree - k):
+            new_pk.append(r * pk[j] + s * pk[j + 1])
+        # Update the "current" values.
+        pk = new_pk
+        left.append(pk[0])
+        right.append(pk[-1])
+
+    right.reverse()
+    return left, right, pk[0]
+
+
+def _derivative(level, degree):
+    r"""Compute a derivative from the control points at one level.
+
+    If ``level`` holds the :math:`k + 1` control points
+    :math:`p_0^{(n - k)}, \ldots, p_k^{(n - k)}`, the :math:`k`-th
+    derivative is :math:`\frac{n!}{(n - k)!} \Delta^k p_0^{(n - k)}`.
+    """
+    diffs = list(level)
+    falling = 1
+    for i in range(len(level) - 1):
+        diffs = [diffs[j + 1] - diffs[j] for j in range(len(diffs) - 1)]
+        falling *= degree - i
+    return falling * diffs[0]
+
+
+def derivatives(s, coeffs, order=1):
+    r"""Compute the value and the first ``order`` derivatives at ``s``.
+
+    The :math:`k`-th derivative only depends on the :math:`k + 1`
+    intermediates at level :math:`n - k` of the reduction, so all of
+    them are computed in the same pass as the value (e.g. the derivative
+    is :math:`n \left(p_1^{(n - 1)} - p_0^{(n - 1)}\right)`). Returns the
+    list :math:`p(s), p'(s), \ldots, p^{(\text{order})}(s)`. The value
+    agrees with :func:`basic` bit for bit.
+    """
+    r = 1 - s
+
+    degree = len(coeffs) - 1
+    pk = list(coeffs)
+    # The (last) levels with at most ``order + 1`` control points.
+    levels = []
+    if degree <= order:
+        levels.append(pk)
+    for k in range(degree):
+        new_pk = []
+        for j in range(degree - k):
+            new_pk.append(r * pk[j] + s * pk[j + 1])
+        # Update the "current" values.
+        pk = new_pk
+        if degree - k <= order + 1:
+            levels.append(pk)
+
+    levels.reverse()
+    result = [_derivative(level, degree) for level in levels]
+    result.extend([0 * pk[0]] * (order + 1 - len(result)))
+    return result
+
+
+def in_place(s, pk):
+    """Performs the "standard" de Casteljau algorithm in place.
+
+    The control points in ``pk`` (a :class:`list`, :class:`array.array`
+    or 1D NumPy array) are overwritten level by level, so only
+    :math:`O(n)` memory is used and nothing is allocated per level. Each
+    :math:`p_j^{(k + 1)}` only depends on :math:`p_j^{(k)}` and
+    :math:`p_{j + 1}^{(k)}`, so updating in order of increasing ``j``
+    uses the same operations (and roundings) as :func:`basic`.
+
+    Since the values are written back into ``pk``, a NumPy array (or
+    :class:`array.array`) must have a floating point type; a
+    :exc:`ValueError` is raised for any other NumPy ``dtype``.
+    """
+    if isinstance(pk, np.ndarray) and not np.issubdtype(
+        pk.dtype, np.floating
+    ):
+        raise ValueError("Control points must be floating point", pk.dtype)
+
+    r = 1 - s
+
+    degree = len(pk) - 1
+    if isinstance(pk, np.ndarray):
+        # NOTE: A single scratch buffer is allocated up front.
+        scratch = np.empty(max(degree, 1), dtype=pk.dtype)
+        for k in range(degree):
+            size = degree - k
+            np.multiply(s, pk[1 : size + 1], out=scratch[:size])
+            np.multiply(r, pk[:size], out=pk[:size])
+            np.add(pk[:size], scratch[:size], out=pk[:size])
+        return pk[0]
+
+    for k in range(degree):
+        for j in range(degree - k):
+            pk[j] = r * pk[j] + s * pk[j + 1]
+
+    return pk[0]
+
+
+# Number of points processed at once by :func:`evaluate_family`; this keeps
+# the work buffer small enough to stay in cache for moderate degrees.
+CHUNK_SIZE = 2048
+
+
+def evaluate_many(s_vals, coeffs):
+    """Performs the "standard" de Casteljau algorithm at many points.
+
+    The reduction is carried out on NumPy arrays (one entry per point),
+    so this is equivalent to calling :func:`basic` at each point. The
+    same sequence of roundings is used, so each value agrees with
+    :func:`basic` bit for bit.
+    """
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    coeffs_mat = np.asarray(coeffs, dtype=np.float64).reshape(1, -1)
+    result = evaluate_family(coeffs_mat, s_vals.ravel())
+    return result[0].reshape(s_vals.shape)
+
+
+def evaluate_family(coeffs_mat, s_vals, out=None):
+    """Evaluate a family of polynomials at many points.
+
+    ``coeffs_mat`` is an ``(m, n + 1)`` array with one polynomial per row
+    (each row ordered as in :func:`basic`) and ``s_vals`` is a vector of
+    ``k`` points. The result is an ``(m, k)`` array; if ``out`` is
+    provided it will be filled and returned.
+
+    The points are processed in chunks of :data:`CHUNK_SIZE`. Within a
+    chunk the control points are stored level-major (i.e. with shape
+    ``(n + 1, m, chunk)``) so that every step of the reduction is a
+    contiguous vector operation. Each value agrees with :func:`basic`
+    bit for bit.
+    """
+    coeffs_mat = np.asarray(coeffs_mat, dtype=np.float64)
+    if coeffs_mat.ndim != 2:
+        raise ValueError("Coefficients must be a 2D array", coeffs_mat.shape)
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    if s_vals.ndim != 1:
+        raise ValueError("Points must be a 1D array", s_vals.shape)
+
+    num_polys, num_coeffs = coeffs_mat.shape
+    num_points, = s_vals.shape
+    if out is None:
+        out = np.empty((num_polys, num_points))
+    elif out.shape != (num_polys, num_points) or out.dtype != np.float64:
+        raise ValueError("Invalid output buffer", out.shape, out.dtype)
+
+    degree = num_coeffs - 1
+    chunk = max(min(CHUNK_SIZE, num_points), 1)
+    pk = np.empty((num_coeffs, num_polys, chunk))
+    scratch = np.empty((max(degree, 1), num_polys, chunk))
+    initial = coeffs_mat.T[:, :, np.newaxis]
+    for start in range(0, num_points, chunk):
+        width = min(chunk, num_points - start)
+        s_chunk = s_vals[start : start + width]
+        r_chunk = 1.0 - s_chunk
+        curr_pk = pk[:, :, :width]
+        curr_scratch = scratch[:, :, :width]
+        curr_pk[:] = initial
+        for k in range(degree):
+            size = degree - k
+            # NOTE: ``s p_{j + 1}`` must be computed before ``p_j`` is
+            #       overwritten (in place) with ``(1 - s) p_j``.
+            np.multiply(
+                s_chunk, curr_pk[1 : size + 1], out=curr_scratch[:size]
+            )
+            np.multiply(r_chunk, curr_pk[:size], out=curr_pk[:size])
+            np.add(curr_pk[:size], curr_scratch[:size], out=curr_pk[:size])
+
+        out[:, start : start + width] = curr_pk[0]
+
+    return out
+
+
+def derivatives_many(s_vals, coeffs, order=1):
+    """Compute the value and the first ``order`` derivatives at many points.
+
+    The result has shape ``(order + 1,) + s_vals.shape``. The same
+    sequence of roundings is used as in :func:`derivatives`, so each
+    value agrees with :func:`derivatives` bit for bit.
+    """
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    flat_s = s_vals.ravel()
+    coeffs_col = np.asarray(coeffs, dtype=np.float64).reshape(-1, 1)
+    degree = coeffs_col.shape[0] - 1
+
+    result = np.zeros((order + 1, flat_s.size))
+    for start in range(0, flat_s.size, CHUNK_SIZE):
+        s_chunk = flat_s[start : start + CHUNK_SIZE]
+        r_chunk = 1.0 - s_chunk
+        pk = np.broadcast_to(coeffs_col, (degree + 1, s_chunk.size))
+        levels = []
+        if degree <= order:
+            levels.append(pk)
+        for k in range(degree):
+            size = degree - k
+            pk = r_chunk * pk[:size] + s_chunk * pk[1 : size + 1]
+            if size <= order + 1:
+                levels.append(pk)
+
+        levels.reverse()
+        for k, level in enumerate(levels):
+            result[k, start : start + s_chunk.size] = _derivative(
+                level, degree
+            )
+
+    return result.reshape((order + 1,) + s_vals.shape)
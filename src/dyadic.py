@@ -0,0 +1,130 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Exact evaluation with dyadic rationals.
+
+Every (finite) floating point number is a dyadic rational, i.e. of the
+form :math:`m 2^e` for integers :math:`m` and :math:`e`. If
+:math:`s = A / 2^E` and the coefficients are :math:`p_j = P_j 2^C` (for a
+shared exponent :math:`C`), then :math:`1 - s = B / 2^E` with
+:math:`B = 2^E - A` and each step of de Casteljau's method
+
+.. math::
+
+    p_j^{(k + 1)} 2^{C - (k + 1) E} =
+        \left(B P_j^{(k)} + A P_{j + 1}^{(k)}\right) 2^{C - (k + 1) E}
+
+only requires integer multiplication and addition. This avoids the
+``gcd`` computed by :class:`fractions.Fraction` after every operation.
+The final result is converted to a :class:`fractions.Fraction`, so it is
+identical to the value computed with :class:`fractions.Fraction` inputs.
+"""
+
+import fractions
+
+
+def to_dyadic(value):
+    """Convert a value to a dyadic pair ``(mantissa, exponent)``.
+
+    The pair satisfies ``value == mantissa * 2**exponent``. ``value`` can
+    be a :class:`float`, an :class:`int` or a :class:`fractions.Fraction`
+    with a power of two denominator.
+    """
+    exact_value = fractions.Fraction(value)
+    denominator = exact_value.denominator
+    exponent = denominator.bit_length() - 1
+    if denominator != 1 << exponent:
+        raise ValueError(value, "Not a dyadic rational")
+
+    return exact_value.numerator, -exponent
+
+
+def to_common_exponent(values):
+    """Convert many values to integers with a shared exponent.
+
+    Returns ``(mantissas, exponent)`` such that each value is equal to
+    ``mantissa * 2**exponent``.
+    """
+    pairs = [to_dyadic(value) for value in values]
+    exponent = min(pair_exponent for _, pair_exponent in pairs)
+    mantissas = [
+        mantissa << (pair_exponent - exponent)
+        for mantissa, pair_exponent in pairs
+    ]
+    return mantissas, exponent
+
+
+def from_dyadic(mantissa, exponent):
+    """Convert a dyadic pair into a :class:`fractions.Fraction`."""
+    if exponent >= 0:
+        return fractions.Fraction(mantissa << exponent)
+
+    return fractions.Fraction(mantissa, 1 << -exponent)
+
+
+def _split_point(s):
+    """Split ``s`` into integers ``A``, ``B`` and ``E``.
+
+    These satisfy ``s = A / 2^E`` and ``1 - s = B / 2^E`` with ``E >= 0``.
+    """
+    mantissa, exponent = to_dyadic(s)
+    if exponent >= 0:
+        mantissa <<= exponent
+        exponent = 0
+
+    shift = -exponent
+    return mantissa, (1 << shift) - mantissa, shift
+
+
+def de_casteljau(s, coeffs):
+    """Performs de Casteljau's algorithm exactly.
+
+    This is equivalent to (but much faster than) calling
+    :func:`de_casteljau.basic` with :class:`fractions.Fraction` inputs.
+    """
+    a_val, b_val, shift = _split_point(s)
+    pk, exponent = to_common_exponent(coeffs)
+
+    degree = len(coeffs) - 1
+    for k in range(degree):
+        for j in range(degree - k):
+            pk[j] = b_val * pk[j] + a_val * pk[j + 1]
+
+    return from_dyadic(pk[0], exponent - degree * shift)
+
+
+def vs_method(s, coeffs):
+    r"""Performs the VS method exactly.
+
+    Computes
+
+    .. math::
+
+        \sum_{j = 0}^n \binom{n}{j} P_j A^j B^{n - j}
+
+    via a homogeneous version of Horner's method (i.e. without division
+    by :math:`s` or :math:`1 - s`) and then scales by
+    :math:`2^{C - n E}`.
+    """
+    a_val, b_val, shift = _split_point(s)
+    mantissas, exponent = to_common_exponent(coeffs)
+
+    degree = len(coeffs) - 1
+    result = mantissas[0]
+    binom_val = 1
+    a_pow = 1
+    for j in range(1, degree + 1):
+        binom_val = binom_val * (degree - j + 1) // j
+        a_pow *= a_val
+        result = result * b_val + binom_val * mantissas[j] * a_pow
+
+    return from_dyadic(result, exponent - degree * shift)
@@ -0,0 +1,277 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content-addressed on-disk cache for exact reference values.
+
+Each entry is keyed by the SHA-256 hash of the evaluator name, the
+source code it depends on and the exact (hex) encoding of the
+arguments, e.g. the point and coefficients. The source code is the
+module defining the evaluator along with every module in ``src/`` (as
+for the artifacts in :mod:`artifacts`), so changing any of them
+invalidates the cached values.
+Values are stored as text, with exact rationals stored in dyadic form
+(a mantissa and a power of two) when possible and as a numerator /
+denominator pair otherwise.
+
+Entries are written to a temporary file and then renamed, so concurrent
+readers (e.g. the workers in :mod:`sweep`) never see a partial entry.
+Reading an entry updates its modification time, and the least recently
+used entries are evicted once the cache exceeds a maximum size. The size
+is checked the first time a process uses the cache and then again each
+time the process has written a fraction of the maximum size.
+
+The cache lives in ``.cache/exact/`` in the project root, unless
+``EXACT_CACHE_DIR`` is set. Setting ``EXACT_CACHE_DIR`` to the empty
+string disables the cache.
+"""
+
+import fractions
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+
+import artifacts
+
+
+FORMAT_VERSION = 2
+CACHE_DIR_ENV = "EXACT_CACHE_DIR"
+MAX_BYTES_ENV = "EXACT_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# The cache size is checked each time a process has written this
+# fraction of the maximum size.
+EVICT_FRACTION = 16
+_MISSING = object()
+_WRITTEN = {"bytes": 0}
+# The cache directories whose size has been checked (in this process).
+_CHECKED = set()
+
+
+def get_cache_dir():
+    """Get the cache directory (or :data:`None` if caching is disabled)."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir is None:
+        curr_dir = os.path.abspath(os.path.dirname(__file__))
+        root_dir = os.path.dirname(curr_dir)
+        return os.path.join(root_dir, ".cache", "exact")
+
+    if cache_dir == "":
+        return None
+
+    return cache_dir
+
+
+def get_max_bytes():
+    return int(os.environ.get(MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+
+
+def encode(value):
+    """Encode a value as text, exactly.
+
+    Supports :class:`float`, :class:`int`, :class:`fractions.Fraction`
+    and (nested) sequences of those.
+    """
+    if isinstance(value, (tuple, list)):
+        return "(" + ",".join(encode(entry) for entry in value) + ")"
+    if isinstance(value, float):
+        return "f:" + value.hex()
+    if isinstance(value, int):
+        return "i:{:x}".format(value)
+    if isinstance(value, fractions.Fraction):
+        denominator = value.denominator
+        exponent = denominator.bit_length() - 1
+        if denominator == 1 << exponent:
+            return "d:{:x}p{:d}".format(value.numerator, -exponent)
+        return "q:{:x}/{:x}".format(value.numerator, denominator)
+
+    raise TypeError("Cannot encode", value)
+
+
+def _split_entries(text):
+    """Split the (comma separated) contents of an encoded sequence."""
+    entries = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            entries.append(text[start:index])
+            start = index + 1
+    if text:
+        entries.append(text[start:])
+    return entries
+
+
+def decode(text):
+    """Decode a value encoded by :func:`encode`."""
+    if text.startswith("("):
+        return tuple(decode(entry) for entry in _split_entries(text[1:-1]))
+
+    kind, body = text.split(":", 1)
+    if kind == "f":
+        return float.fromhex(body)
+    if kind == "i":
+        return int(body, 16)
+    if kind == "d":
+        mantissa, exponent = body.split("p")
+        exponent = int(exponent)
+        if exponent >= 0:
+            return fractions.Fraction(int(mantissa, 16) << exponent)
+        return fractions.Fraction(int(mantissa, 16), 1 << -exponent)
+    if kind == "q":
+        numerator, denominator = body.split("/")
+        return fractions.Fraction(int(numerator, 16), int(denominator, 16))
+
+    raise ValueError("Cannot decode", text)
+
+
+def make_key(name, args, source_key=""):
+    """Make the (content-addressed) key for an evaluator and arguments.
+
+    ``source_key`` identifies the source code the evaluator depends on
+    (see :func:`get_source_key`).
+    """
+    text = "{}|{}|{}|{}".format(
+        FORMAT_VERSION, name, source_key, encode(args)
+    )
+    return hashlib.sha256(text.encode("ascii")).hexdigest()
+
+
+def get_source_key(func):
+    """Hash the source code that ``func`` depends on.
+
+    This is the module that defines ``func`` along with every module in
+    ``src/`` (see :func:`artifacts.source_paths`).
+    """
+    paths = artifacts.source_paths(inspect.getsourcefile(func))
+    return artifacts.make_key("exact_cache", paths)
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], key[2:])
+
+
+def load(cache_dir, key):
+    """Load an entry from the cache.
+
+    Returns :data:`_MISSING` if there is no entry for ``key``.
+    """
+    path = _entry_path(cache_dir, key)
+    try:
+        with open(path, "r") as file_obj:
+            text = file_obj.read()
+        os.utime(path)
+    except (IOError, OSError):
+        # NOTE: The entry may have been evicted by another process.
+        return _MISSING
+
+    return decode(text)
+
+
+def store(cache_dir, key, value):
+    """Store an entry in the cache (atomically)."""
+    path = _entry_path(cache_dir, key)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    text = encode(value)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as file_obj:
+            file_obj.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    max_bytes = get_max_bytes()
+    _WRITTEN["bytes"] += len(text)
+    if _WRITTEN["bytes"] >= max_bytes // EVICT_FRACTION:
+        _WRITTEN["bytes"] = 0
+        evict(cache_dir, max_bytes)
+
+
+def check_size(cache_dir):
+    """Evict entries (if needed) the first time a process uses the cache.
+
+    Otherwise a cache that is already over the maximum size would only
+    shrink once the process has written enough new entries.
+    """
+    if cache_dir in _CHECKED:
+        return
+    _CHECKED.add(cache_dir)
+    if os.path.isdir(cache_dir):
+        evict(cache_dir, get_max_bytes())
+
+
+def evict(cache_dir, max_bytes):
+    """Remove the least recently used entries until under ``max_bytes``."""
+    entries = []
+    total = 0
+    for dirpath, _, filenames in os.walk(cache_dir):
+        for filename in filenames:
+            if filename.startswith(".tmp-"):
+                # NOTE: Skip entries that are still being written.
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat_result.st_mtime, stat_result.st_size, path))
+            total += stat_result.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def memoize(name):
+    """Decorator to cache the results of an exact evaluator on disk.
+
+    ``name`` identifies the evaluator (it is part of every key) and the
+    source code it depends on is hashed once per process (see
+    :func:`get_source_key`). The arguments and result must be supported
+    by :func:`encode`.
+    """
+
+    def decorator(func):
+        source_keys = []
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            cache_dir = get_cache_dir()
+            if cache_dir is None:
+                return func(*args)
+
+            check_size(cache_dir)
+            if not source_keys:
+                source_keys.append(get_source_key(func))
+            key = make_key(name, args, source_keys[0])
+            value = load(cache_dir, key)
+            if value is _MISSING:
+                value = func(*args)
+                store(cache_dir, key, value)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,281 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Parametric sweeps over the "curbed" family of polynomials.
+
+The family is
+
+.. math::
+
+    p(s) = \left(1 - (k + 1) s\right)^n = \left[(1 - s) - k s\right]^n,
+    \quad \widetilde{p}(s) = \left[(1 - s) + k s\right]^n =
+    \left(1 + (k - 1) s\right)^n
+
+(i.e. with Bernstein coefficients :math:`(-k)^j`), evaluated near the
+root at the point
+
+.. math::
+
+    s = \frac{1}{k + 1} + \frac{2k}{(k + 1)^2 N}.
+
+Records are produced lazily by generators (one per ``(k, n, N)``) and
+consumed by a sink, so a sweep over a large grid never holds more than
+one record (or one chunk of records) in memory.
+"""
+
+import collections
+import csv
+import fractions
+import functools
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+import closed_form
+import utils
+
+
+F = fractions.Fraction
+GAMMA3 = utils.gamma(3)
+# Number of records buffered by ``to_npz()`` before writing.
+NPZ_CHUNK_SIZE = 4096
+# The number of family members kept by ``get_polynomial()``.
+POLYNOMIAL_CACHE_SIZE = 64
+
+Record = collections.namedtuple("Record", ["k", "n", "N", "bound", "error"])
+CurbedRecord = collections.namedtuple(
+    "CurbedRecord", ["k", "n", "N", "bound1", "bound2", "error"]
+)
+
+
+def get_point(k, N):
+    """Get the point :math:`1/(k + 1) + 2k/((k + 1)^2 N)` exactly."""
+    return F(1, k + 1) + F(2 * k, (k + 1) ** 2 * N)
+
+
+def get_coeffs(k, n):
+    """Get the Bernstein coefficients of :math:`(1 - (k + 1) s)^n`."""
+    return tuple((-k) ** j for j in range(n + 1))
+
+
+@functools.lru_cache(maxsize=POLYNOMIAL_CACHE_SIZE)
+def get_polynomial(k, n):
+    """Get :math:`(1 - (k + 1) s)^n` with its closed form."""
+    return closed_form.Polynomial.from_power(
+        1, -(k + 1), n, coeffs=get_coeffs(k, n)
+    )
+
+
+def bound(k, n, N):
+    r"""Compute the a priori error bound.
+
+    Will be :math:`\gamma_{3n} \widetilde{p}(s) / p(s)`, computed exactly
+    from the closed forms (and then rounded).
+    """
+    s = get_point(k, N)
+    p_exact = (1 - (k + 1) * s) ** n
+    ptilde_exact = (1 + (k - 1) * s) ** n
+    bound_val = utils.gamma(3 * n) * ptilde_exact / p_exact
+    return float(abs(bound_val))
+
+
+def error(k, n, N):
+    """Compute the observed relative error of de Casteljau's method."""
+    s = get_point(k, N)
+    polynomial = get_polynomial(k, n)
+    p_exact = polynomial.exact(s)
+    p_computed = polynomial(float(s))
+    err_exact = abs((F(p_computed) - p_exact) / p_exact)
+    return float(err_exact)
+
+
+def custom_de_casteljau(s, k, n):
+    """Evaluate :math:`(1 - (k + 1) s)^n` in a "special" way.
+
+    Does so via ``p{n} = 1``, ``p{j} = (1 - s) p{j+1} - ks p{j + 1}``.
+    """
+    p = 1
+    r = 1 - s
+    scaled = k * s
+    for _ in range(n):
+        p = r * p - scaled * p
+    return p
+
+
+def abs_phi(s, k):
+    s = F(s)
+    return abs((1 + (k - 1) * s) / (1 - (k + 1) * s))
+
+
+def bounds_curbed(s, k, n):
+    """Compute the naive and improved bounds and the observed error.
+
+    The errors are for :func:`custom_de_casteljau` evaluated at the
+    float ``s``.
+    """
+    phi = abs_phi(s, k)
+    bound1 = utils.gamma(3 * n) * phi ** n
+    bound2 = (1 + phi * GAMMA3) ** n - 1
+    if bound1 <= 0:
+        raise ValueError(bound1, float(bound1))
+    if bound2 <= 0:
+        raise ValueError(bound2, float(bound2))
+
+    computed_p = custom_de_casteljau(s, k, n)
+    exact_p = custom_de_casteljau(F(s), k, n)
+    if not isinstance(exact_p, F):
+        raise TypeError(exact_p)
+    observed_err = abs((computed_p - exact_p) / exact_p)
+
+    return float(bound1), float(bound2), float(observed_err)
+
+
+def get_N_values(base=2.1, num_values=45):
+    r"""Get the values :math:`N = b^1, \ldots, b^m` used in the sweeps."""
+    return [base ** exponent for exponent in range(1, num_values + 1)]
+
+
+def grid_size(ks, ns, N_values):
+    return len(ks) * len(ns) * len(N_values)
+
+
+def records(ks, ns, N_values):
+    """Generate a priori bound / observed error records.
+
+    ``ks``, ``ns`` and ``N_values`` must be sequences (they are iterated
+    over more than once).
+    """
+    for k in ks:
+        for n in ns:
+            for N in N_values:
+                exact_N = F(N)
+                yield Record(
+                    k, n, N, bound(k, n, exact_N), error(k, n, exact_N)
+                )
+
+
+def curbed_records(ks, ns, N_values):
+    """Generate naive / improved bound and observed error records.
+
+    ``ks``, ``ns`` and ``N_values`` must be sequences (they are iterated
+    over more than once).
+    """
+    for k in ks:
+        for n in ns:
+            for N in N_values:
+                s = float(get_point(k, F(N)))
+                yield CurbedRecord(k, n, N, *bounds_curbed(s, k, n))
+
+
+def to_csv(records_iter, file_obj):
+    """Write records (one row at a time) to an open CSV file."""
+    writer = csv.writer(file_obj)
+    header_written = False
+    for record in records_iter:
+        if not header_written:
+            writer.writerow(record._fields)
+            header_written = True
+        writer.writerow(record)
+
+
+def _record_dtype(fields):
+    return np.dtype(
+        [
+            (field, "<i8" if field in ("k", "n") else "<f8")
+            for field in fields
+        ]
+    )
+
+
+def _write_records(file_obj, records_iter, count, dtype):
+    """Write an ``.npy`` file with ``count`` records in chunks."""
+    header = {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": (count,),
+    }
+    np.lib.format.write_array_header_1_0(file_obj, header)
+    buffer_ = np.empty(NPZ_CHUNK_SIZE, dtype=dtype)
+    written = 0
+    filled = 0
+    for record in records_iter:
+        if written + filled >= count:
+            raise ValueError("More records than expected", count)
+        buffer_[filled] = tuple(record)
+        filled += 1
+        if filled == NPZ_CHUNK_SIZE:
+            file_obj.write(buffer_.tobytes())
+            written += filled
+            filled = 0
+    file_obj.write(buffer_[:filled].tobytes())
+    written += filled
+
+    if written != count:
+        raise ValueError("Fewer records than expected", written, count)
+
+
+def to_npz(records_iter, path, count, fields=Record._fields):
+    """Write records to an NPZ file with a ``records`` structured array.
+
+    Since the ``.npy`` header contains the shape, the number of records
+    must be known up front (e.g. via :func:`grid_size`). The records are
+    written in chunks of :data:`NPZ_CHUNK_SIZE` directly into the
+    archive, so the full array is never held in memory. The archive is
+    written to a temporary file which only replaces ``path`` once every
+    record has been written, so a failed write leaves ``path`` as it was.
+    """
+    dtype = _record_dtype(fields)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or os.curdir, prefix=".tmp-"
+    )
+    try:
+        with os.fdopen(fd, "wb") as raw_file:
+            with zipfile.ZipFile(raw_file, "w") as archive:
+                with archive.open(
+                    "records.npy", "w", force_zip64=True
+                ) as file_obj:
+                    _write_records(file_obj, records_iter, count, dtype)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def summarize(records_iter):
+    """Reduce records to per-``(k, n)`` summaries.
+
+    Returns a dictionary mapping ``(k, n)`` to the number of records and
+    the largest observed error, (first) bound and error / bound ratio.
+    Only these summaries are kept in memory.
+    """
+    summaries = collections.OrderedDict()
+    for record in records_iter:
+        bound_val = record[3]
+        summary = summaries.setdefault(
+            (record.k, record.n),
+            {
+                "count": 0,
+                "max_error": 0.0,
+                "max_bound": 0.0,
+                "max_ratio": 0.0,
+            },
+        )
+        summary["count"] += 1
+        summary["max_error"] = max(summary["max_error"], record.error)
+        summary["max_bound"] = max(summary["max_bound"], bound_val)
+        summary["max_ratio"] = max(
+            summary["max_ratio"], record.error / bound_val
+        )
+
+    return summaries
@@ -0,0 +1,344 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Opt-in instrumentation of the evaluators.
+
+Within :func:`enabled`, the evaluators (:func:`de_casteljau.basic`,
+:func:`vs_method.basic` and :func:`families.custom_de_casteljau`) and
+the binomial coefficient helpers (:func:`utils.binomial` and
+:func:`utils.binomial_row`) are replaced (on their modules) by wrappers
+that record
+
+* the number of calls, multiplies and adds (the counts are analytic,
+  i.e. determined by the degree, rather than traced),
+* the number of calls into the binomial coefficient helpers,
+* the largest numerator and denominator (in bits) reached when
+  evaluating with :class:`fractions.Fraction` inputs and
+* the wall time spent in each evaluator.
+
+The tallies are kept per evaluator, per experiment script (see
+:func:`timer`) and in total. The originals are restored on exit, so
+there is no overhead when instrumentation is disabled.
+
+.. note::
+
+   Only calls made through the module attribute (e.g.
+   ``de_casteljau.basic(s, coeffs)``) are counted, and only in the
+   current process (a sweep should be run serially, see :mod:`sweep`).
+   Values read from the exact cache (see :mod:`exact_cache`) are not
+   evaluated, so ``EXACT_CACHE_DIR`` should be empty to trace the
+   rational growth of a sweep.
+"""
+
+import contextlib
+import fractions
+import functools
+import time
+
+import de_casteljau
+import families
+import utils
+import vs_method
+
+
+TOTAL = "total"
+_ACTIVE = []
+
+
+class Tally(object):
+    """Counts for a single evaluator, script or for a whole run."""
+
+    def __init__(self):
+        self.calls = 0
+        self.multiplies = 0
+        self.adds = 0
+        self.binomial_calls = 0
+        self.numerator_bits = 0
+        self.denominator_bits = 0
+        self.seconds = 0.0
+
+
+class Counters(object):
+    """The tallies recorded while instrumentation is enabled.
+
+    ``evaluators`` and ``scripts`` map names to :class:`Tally` objects
+    and ``total`` accumulates every count (other than time).
+    """
+
+    def __init__(self):
+        self.total = Tally()
+        self.evaluators = {}
+        self.scripts = {}
+        self._stack = [self.total]
+
+    def _tallies(self):
+        # The same tally may be active more than once, e.g. for nested
+        # calls to one evaluator.
+        seen = []
+        for tally in self._stack:
+            if not any(tally is other for other in seen):
+                seen.append(tally)
+        return seen
+
+    def add_ops(self, multiplies, adds):
+        for tally in self._tallies():
+            tally.multiplies += multiplies
+            tally.adds += adds
+
+    def add_call(self):
+        for tally in self._tallies():
+            tally.calls += 1
+
+    def add_binomial_call(self):
+        for tally in self._tallies():
+            tally.binomial_calls += 1
+
+    def add_bits(self, value):
+        numerator_bits = value.numerator.bit_length()
+        denominator_bits = value.denominator.bit_length()
+        for tally in self._tallies():
+            if numerator_bits > tally.numerator_bits:
+                tally.numerator_bits = numerator_bits
+            if denominator_bits > tally.denominator_bits:
+                tally.denominator_bits = denominator_bits
+
+    @contextlib.contextmanager
+    def scope(self, tallies, name):
+        """Make ``tallies[name]`` active and time the enclosed block."""
+        tally = tallies.setdefault(name, Tally())
+        self._stack.append(tally)
+        start = time.perf_counter()
+        try:
+            yield tally
+        finally:
+            tally.seconds += time.perf_counter() - start
+            self._stack.pop()
+
+    def format(self):
+        """Format the tallies as a table."""
+        header = "{:30} {:>10} {:>14} {:>14} {:>10} {:>6} {:>6} {:>10}"
+        row = "{:30} {:10d} {:14d} {:14d} {:10d} {:6d} {:6d} {:10.3f}"
+        lines = [
+            header.format(
+                "name",
+                "calls",
+                "multiplies",
+                "adds",
+                "binomials",
+                "num",
+                "den",
+                "seconds",
+            )
+        ]
+        sections = (
+            sorted(self.scripts.items())
+            + sorted(self.evaluators.items())
+            + [(TOTAL, self.total)]
+        )
+        for name, tally in sections:
+            lines.append(
+                row.format(
+                    name,
+                    tally.calls,
+                    tally.multiplies,
+                    tally.adds,
+                    tally.binomial_calls,
+                    tally.numerator_bits,
+                    tally.denominator_bits,
+                    tally.seconds,
+                )
+            )
+        return "\n".join(lines)
+
+
+def _record_bits(value):
+    if _ACTIVE:
+        _ACTIVE[-1].add_bits(value)
+
+
+def _traced_operator(name):
+    method = getattr(fractions.Fraction, name)
+
+    @functools.wraps(method)
+    def traced(*args):
+        result = method(*args)
+        if isinstance(result, fractions.Fraction):
+            _record_bits(result)
+            return TracingFraction(result)
+        return result
+
+    return traced
+
+
+class TracingFraction(fractions.Fraction):
+    """A :class:`fractions.Fraction` that records its size after each step.
+
+    The result of each arithmetic operation is also a
+    :class:`TracingFraction`, so an entire evaluation is traced.
+    """
+
+    __slots__ = ()
+
+
+for _name in (
+    "__add__",
+    "__radd__",
+    "__sub__",
+    "__rsub__",
+    "__mul__",
+    "__rmul__",
+    "__truediv__",
+    "__rtruediv__",
+    "__neg__",
+    "__pos__",
+    "__abs__",
+):
+    setattr(TracingFraction, _name, _traced_operator(_name))
+del _name
+
+
+def _trace(value):
+    if isinstance(value, fractions.Fraction):
+        _record_bits(value)
+        return TracingFraction(value)
+    return value
+
+
+def _untrace(value):
+    if isinstance(value, TracingFraction):
+        return fractions.Fraction(value)
+    return value
+
+
+def de_casteljau_ops(s, coeffs):
+    """Count the multiplies and adds in :func:`de_casteljau.basic`.
+
+    Each of the :math:`n(n + 1)/2` steps is :math:`(1 - s) p_j + s
+    p_{j + 1}` and computing :math:`1 - s` is one more add.
+    """
+    degree = len(coeffs) - 1
+    steps = degree * (degree + 1) // 2
+    return 2 * steps, steps + 1
+
+
+def vs_method_ops(s, coeffs):
+    r"""Count the multiplies and adds in :func:`vs_method.basic`.
+
+    Computing :math:`\sigma` (one add and a divide, counted as a
+    multiply) is followed by :math:`n` binomial scalings, :math:`n`
+    Horner steps and :math:`n` multiplies by :math:`(1 - s)` or
+    :math:`s`.
+    """
+    degree = len(coeffs) - 1
+    return 3 * degree + 1, degree + 1
+
+
+def custom_de_casteljau_ops(s, k, n):
+    """Count the multiplies and adds in :func:`families.custom_de_casteljau`.
+
+    After computing :math:`1 - s` and :math:`ks`, each of the :math:`n`
+    steps is :math:`(1 - s) p - ks p`.
+    """
+    return 2 * n + 1, n + 1
+
+
+def _trace_arg(value):
+    if isinstance(value, (tuple, list)):
+        return type(value)(_trace(entry) for entry in value)
+    return _trace(value)
+
+
+def _instrument_evaluator(counters, name, func, count_ops):
+    @functools.wraps(func)
+    def wrapper(*args):
+        with counters.scope(counters.evaluators, name):
+            counters.add_call()
+            counters.add_ops(*count_ops(*args))
+            return _untrace(func(*map(_trace_arg, args)))
+
+    return wrapper
+
+
+def _instrument_binomial(counters, func):
+    @functools.wraps(func)
+    def wrapper(*args):
+        counters.add_binomial_call()
+        return func(*args)
+
+    return wrapper
+
+
+# The evaluators (module, attribute and operation counts) that are
+# instrumented.
+EVALUATORS = (
+    (de_casteljau, "basic", de_casteljau_ops),
+    (vs_method, "basic", vs_method_ops),
+    (families, "custom_de_casteljau", custom_de_casteljau_ops),
+)
+BINOMIALS = ((utils, "binomial"), (utils, "binomial_row"))
+
+
+@contextlib.contextmanager
+def enabled():
+    """Enable instrumentation for the enclosed block.
+
+    Yields the :class:`Counters` being recorded. This can't be nested.
+    """
+    if _ACTIVE:
+        raise RuntimeError("Instrumentation is already enabled")
+
+    counters = Counters()
+    patches = []
+    for module, name, count_ops in EVALUATORS:
+        func = getattr(module, name)
+        full_name = "{}.{}".format(module.__name__, name)
+        patches.append(
+            (
+                module,
+                name,
+                _instrument_evaluator(counters, full_name, func, count_ops),
+            )
+        )
+    for module, name in BINOMIALS:
+        func = getattr(module, name)
+        patches.append((module, name, _instrument_binomial(counters, func)))
+
+    originals = [
+        (module, name, getattr(module, name)) for module, name, _ in patches
+    ]
+    for module, name, wrapper in patches:
+        setattr(module, name, wrapper)
+    _ACTIVE.append(counters)
+    start = time.perf_counter()
+    try:
+        yield counters
+    finally:
+        counters.total.seconds += time.perf_counter() - start
+        _ACTIVE.pop()
+        for module, name, original in originals:
+            setattr(module, name, original)
+
+
+@contextlib.contextmanager
+def timer(name):
+    """Time an experiment script (if instrumentation is enabled).
+
+    The counts recorded in the enclosed block are also tallied under
+    ``name``.
+    """
+    if not _ACTIVE:
+        yield None
+        return
+
+    counters = _ACTIVE[-1]
+    with counters.scope(counters.scripts, name) as tally:
+        yield tally
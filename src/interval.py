@@ -0,0 +1,272 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Evaluates a polynomial in Bernstein form with interval arithmetic.
+
+Every intermediate value is replaced by an interval
+:math:`\left[\ell, h\right]` that is guaranteed to contain the exact
+value. Since the rounding mode can't be changed from Python, each
+operation is carried out with rounding to nearest and the result is
+then moved outward by one unit in the last place (via ``nextafter``).
+The only exception is :math:`1 - s`, for which the exact rounding error
+is known (see :func:`compensated.two_sum`).
+
+The final enclosure can be used to certify a floating point result: if
+:func:`relative_error` is small enough, there is no need to compute the
+exact value. This assumes that no underflow or overflow occurs.
+
+As in :func:`vs_method.basic`, the coefficients are reversed when
+:math:`s < 1/2` so that :math:`\sigma` is at most one.
+"""
+
+import math
+
+import numpy as np
+
+import compensated
+import utils
+
+
+INF = float("inf")
+if hasattr(math, "nextafter"):
+    _nextafter = math.nextafter
+else:
+
+    def _nextafter(value1, value2):
+        # NOTE: ``math.nextafter()`` was added in Python 3.9.
+        return float(np.nextafter(value1, value2))
+
+
+def down(value):
+    """Get the largest float smaller than ``value``."""
+    return _nextafter(value, -INF)
+
+
+def up(value):
+    """Get the smallest float larger than ``value``."""
+    return _nextafter(value, INF)
+
+
+def _add(interval1, interval2):
+    return (
+        down(interval1[0] + interval2[0]),
+        up(interval1[1] + interval2[1]),
+    )
+
+
+def _mul(interval1, interval2):
+    products = (
+        interval1[0] * interval2[0],
+        interval1[0] * interval2[1],
+        interval1[1] * interval2[0],
+        interval1[1] * interval2[1],
+    )
+    return down(min(products)), up(max(products))
+
+
+def _div(interval1, interval2):
+    """Divide by an interval that is (strictly) positive."""
+    quotients = (
+        interval1[0] / interval2[0],
+        interval1[0] / interval2[1],
+        interval1[1] / interval2[0],
+        interval1[1] / interval2[1],
+    )
+    return down(min(quotients)), up(max(quotients))
+
+
+def _one_minus(s):
+    """Enclose :math:`1 - s` (usually with a single float)."""
+    r, rho = compensated.two_sum(1.0, -s)
+    if rho > 0:
+        return r, up(r)
+    if rho < 0:
+        return down(r), r
+    return r, r
+
+
+def de_casteljau(s, coeffs):
+    """Performs de Casteljau's algorithm with interval arithmetic.
+
+    Returns a pair ``(lo, hi)`` that encloses the exact value of the
+    polynomial (with float coefficients) at the float ``s``.
+    """
+    r = _one_minus(s)
+    s = (s, s)
+
+    degree = len(coeffs) - 1
+    pk = [(coeff, coeff) for coeff in coeffs]
+    for k in range(degree):
+        new_pk = []
+        for j in range(degree - k):
+            new_pk.append(_add(_mul(r, pk[j]), _mul(s, pk[j + 1])))
+        # Update the "current" values.
+        pk = new_pk
+
+    return pk[0]
+
+
+def vs_method(s, coeffs):
+    """Performs the VS method with interval arithmetic.
+
+    Returns a pair ``(lo, hi)`` that encloses the exact value of the
+    polynomial (with float coefficients) at the float ``s``.
+    """
+    n = len(coeffs) - 1
+    r = _one_minus(s)
+    if s >= 0.5:
+        sigma = _div(r, (s, s))
+        multiplier = (s, s)
+    else:
+        sigma = _div((s, s), r)
+        multiplier = r
+        coeffs = coeffs[::-1]
+
+    binom_row = utils.binomial_row(n)
+    result = (coeffs[0], coeffs[0])
+    for j in range(1, n + 1):
+        modified_coeff = _mul((binom_row[j], binom_row[j]), (coeffs[j],) * 2)
+        result = _add(_mul(result, sigma), modified_coeff)
+
+    for _ in range(n):
+        result = _mul(multiplier, result)
+
+    return result
+
+
+def _add_many(lo1, hi1, lo2, hi2):
+    return (
+        np.nextafter(lo1 + lo2, -np.inf),
+        np.nextafter(hi1 + hi2, np.inf),
+    )
+
+
+def _mul_many(lo1, hi1, lo2, hi2):
+    products = (lo1 * lo2, lo1 * hi2, hi1 * lo2, hi1 * hi2)
+    return (
+        np.nextafter(np.minimum.reduce(products), -np.inf),
+        np.nextafter(np.maximum.reduce(products), np.inf),
+    )
+
+
+def _div_many(lo1, hi1, lo2, hi2):
+    quotients = (lo1 / lo2, lo1 / hi2, hi1 / lo2, hi1 / hi2)
+    return (
+        np.nextafter(np.minimum.reduce(quotients), -np.inf),
+        np.nextafter(np.maximum.reduce(quotients), np.inf),
+    )
+
+
+def _one_minus_many(s_vals):
+    r_vals, rho = compensated.two_sum(1.0, -s_vals)
+    return (
+        np.where(rho < 0, np.nextafter(r_vals, -np.inf), r_vals),
+        np.where(rho > 0, np.nextafter(r_vals, np.inf), r_vals),
+    )
+
+
+def de_casteljau_many(s_vals, coeffs):
+    """Performs de Casteljau's algorithm with intervals at many points.
+
+    Returns a pair of arrays ``(lo, hi)``; each enclosure is the same as
+    the one computed by :func:`de_casteljau`.
+    """
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    r_lo, r_hi = _one_minus_many(s_vals)
+
+    degree = len(coeffs) - 1
+    lo = [np.full(s_vals.shape, coeff, dtype=np.float64) for coeff in coeffs]
+    hi = lo
+    for k in range(degree):
+        new_lo = []
+        new_hi = []
+        for j in range(degree - k):
+            left = _mul_many(r_lo, r_hi, lo[j], hi[j])
+            right = _mul_many(s_vals, s_vals, lo[j + 1], hi[j + 1])
+            new_lo_j, new_hi_j = _add_many(*(left + right))
+            new_lo.append(new_lo_j)
+            new_hi.append(new_hi_j)
+        # Update the "current" values.
+        lo = new_lo
+        hi = new_hi
+
+    return lo[0], hi[0]
+
+
+def vs_method_many(s_vals, coeffs):
+    """Performs the VS method with intervals at many points.
+
+    Returns a pair of arrays ``(lo, hi)``; each enclosure is the same as
+    the one computed by :func:`vs_method`.
+    """
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    n = len(coeffs) - 1
+    binom_row = utils.binomial_row(n)
+
+    lo = np.empty(s_vals.shape)
+    hi = np.empty(s_vals.shape)
+    upper = s_vals >= 0.5
+    for mask, oriented in ((upper, coeffs), (~upper, coeffs[::-1])):
+        s_part = s_vals[mask]
+        r_lo, r_hi = _one_minus_many(s_part)
+        if oriented is coeffs:
+            sigma = _div_many(r_lo, r_hi, s_part, s_part)
+            multiplier = (s_part, s_part)
+        else:
+            sigma = _div_many(s_part, s_part, r_lo, r_hi)
+            multiplier = (r_lo, r_hi)
+
+        part = (
+            np.full(s_part.shape, oriented[0], dtype=np.float64),
+            np.full(s_part.shape, oriented[0], dtype=np.float64),
+        )
+        for j in range(1, n + 1):
+            modified_coeff = _mul(
+                (binom_row[j], binom_row[j]), (oriented[j], oriented[j])
+            )
+            part = _add_many(*(_mul_many(*(part + sigma)) + modified_coeff))
+
+        for _ in range(n):
+            part = _mul_many(*(multiplier + part))
+
+        lo[mask], hi[mask] = part
+
+    return lo, hi
+
+
+def relative_error(lo, hi, value):
+    r"""Bound the relative error of ``value`` within an enclosure.
+
+    Returns (an upper bound on) :math:`\max |v - p| / |p|` over all
+    :math:`p \in \left[\ell, h\right]`, or ``inf`` if the enclosure
+    contains zero. Works for both scalars and NumPy arrays.
+    """
+    lo = np.asarray(lo, dtype=np.float64)
+    hi = np.asarray(hi, dtype=np.float64)
+    distance = np.nextafter(
+        np.maximum(np.abs(value - lo), np.abs(hi - value)), np.inf
+    )
+    smallest = np.where(
+        (lo > 0) | (hi < 0), np.minimum(np.abs(lo), np.abs(hi)), 0.0
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.nextafter(distance / smallest, np.inf)
+    return np.where(smallest > 0, result, np.inf)
+
+
+def is_tight(lo, hi, value, rtol):
+    """Check if ``value`` is within ``rtol`` (relative) of an enclosure.
+
+    If so, ``value`` is certified to have a relative error of at most
+    ``rtol`` and an exact evaluation can be skipped.
+    """
+    return relative_error(lo, hi, value) <= rtol
@@ -0,0 +1,108 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Evaluates a polynomial in Bernstein form via the power basis.
+
+The Bernstein coefficients are converted (once) to the monomial basis
+
+.. math::
+
+    p(s) = \sum_{k = 0}^n a_k s^k, \quad a_k = \binom{n}{k}
+        \Delta^k p_0 = \binom{n}{k} \sum_{j = 0}^k (-1)^{k - j}
+        \binom{k}{j} p_j
+
+and then evaluated with Horner's method in :math:`O(n)` operations. This
+is only accurate for well-conditioned polynomials: the conversion itself
+can introduce large errors, since the monomial basis is much worse
+conditioned than the Bernstein basis on :math:`\left[0, 1\right]`.
+
+For the scaled power form :math:`\sum_j \binom{n}{j} p_j \sigma^j`, see
+:func:`vs_method.cached`.
+
+The forward differences start from ``coeffs[0]``, the value of the
+polynomial at :math:`s = 0`.
+"""
+
+import fractions
+import functools
+
+import numpy as np
+
+
+# The number of coefficient sets kept by ``convert()``.
+CONVERT_CACHE_SIZE = 128
+
+
+@functools.lru_cache(maxsize=CONVERT_CACHE_SIZE)
+def convert(coeffs, exact=False):
+    r"""Convert Bernstein coefficients to monomial coefficients.
+
+    Returns the coefficients :math:`a_0, \ldots, a_n` (in increasing
+    order of degree) as floats. If ``exact`` is :data:`True`, the
+    forward differences are computed exactly and only the final values
+    are rounded. Otherwise they are computed in floating point. The most
+    recently used coefficient sets are cached, so ``coeffs`` must be
+    hashable (e.g. a :class:`tuple`).
+
+    Since :math:`a_k` grows like :math:`\binom{n}{k} 2^k` (for
+    coefficients of size about one), this limits the degree to a few
+    hundred: a :exc:`ValueError` is raised if any :math:`a_k` is too
+    large to be represented as a float (e.g. at degree 1000).
+    """
+    n = len(coeffs) - 1
+    if exact:
+        diffs = [fractions.Fraction(coeff) for coeff in coeffs]
+    else:
+        diffs = [float(coeff) for coeff in coeffs]
+
+    monomial = []
+    binom_val = 1
+    for k in range(n + 1):
+        try:
+            monomial.append(float(binom_val * fractions.Fraction(diffs[0])))
+        except OverflowError:
+            raise ValueError("Cannot be represented as a float")
+        binom_val = binom_val * (n - k) // (k + 1)
+        diffs = [diffs[j + 1] - diffs[j] for j in range(n - k)]
+
+    return tuple(monomial)
+
+
+def horner(s, monomial):
+    """Evaluate a polynomial in the monomial basis via Horner's method.
+
+    ``monomial`` is ordered in increasing order of degree. This works
+    for both scalars and NumPy arrays.
+    """
+    result = monomial[-1]
+    for coeff in monomial[-2::-1]:
+        result = result * s + coeff
+    return result
+
+
+def basic(s, coeffs, exact=False):
+    """Evaluate via a (cached) conversion to the monomial basis."""
+    return horner(s, convert(tuple(coeffs), exact=exact))
+
+
+def evaluate_many(s_vals, coeffs, exact=False):
+    """Evaluate at many points via the monomial basis.
+
+    Each value agrees with :func:`basic` bit for bit.
+    """
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    monomial = convert(tuple(coeffs), exact=exact)
+    result = np.full(s_vals.shape, monomial[-1], dtype=np.float64)
+    for coeff in monomial[-2::-1]:
+        result *= s_vals
+        result += coeff
+    return result
@@ -0,0 +1,226 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Registry of polynomials stored in a compact (memory-mapped) file.
+
+The file layout (all values little-endian) is:
+
+* A header: the magic bytes, the format version, the number of
+  polynomials and the offset of the index.
+* For each polynomial, the coefficients as raw ``float64`` values
+  (8-byte aligned) optionally followed by exact coefficients. Each
+  exact coefficient is a numerator / denominator pair and each integer
+  is stored as a ``uint32`` byte length followed by the (signed) bytes.
+* The names (UTF-8) followed by the index: one fixed-size entry per
+  polynomial with the offsets of its name, coefficients and exact
+  coefficients.
+
+Reading only parses the header. Index entries are parsed on demand and
+the coefficients are returned as read-only NumPy views into the
+memory-mapped file, so nothing is copied.
+"""
+
+import fractions
+import mmap
+import struct
+
+import numpy as np
+
+
+MAGIC = b"CCPOLY\x00\x00"
+FORMAT_VERSION = 1
+# magic, version, count, index offset
+HEADER = struct.Struct("<8sIIQ")
+# name offset, name length, degree, data offset, exact offset, exact length
+INDEX_ENTRY = struct.Struct("<QIIQQQ")
+LENGTH = struct.Struct("<I")
+ALIGNMENT = 8
+
+
+def _pad(file_obj):
+    remainder = file_obj.tell() % ALIGNMENT
+    if remainder:
+        file_obj.write(b"\x00" * (ALIGNMENT - remainder))
+
+
+def _encode_int(value):
+    num_bytes = (value.bit_length() + 8) // 8
+    return LENGTH.pack(num_bytes) + value.to_bytes(
+        num_bytes, "little", signed=True
+    )
+
+
+def _decode_int(buffer_, offset):
+    (num_bytes,) = LENGTH.unpack_from(buffer_, offset)
+    start = offset + LENGTH.size
+    value = int.from_bytes(
+        buffer_[start : start + num_bytes], "little", signed=True
+    )
+    return value, start + num_bytes
+
+
+def write(path, polynomials):
+    """Write polynomials to a registry file.
+
+    ``polynomials`` is an iterable of ``(name, coeffs)`` or
+    ``(name, coeffs, exact_coeffs)`` tuples; it is consumed one
+    polynomial at a time. ``exact_coeffs`` (if provided) can be any
+    values accepted by :class:`fractions.Fraction`.
+    """
+    entries = []
+    with open(path, "wb") as file_obj:
+        file_obj.write(b"\x00" * HEADER.size)
+        for polynomial in polynomials:
+            name, coeffs = polynomial[:2]
+            exact_coeffs = polynomial[2] if len(polynomial) > 2 else None
+
+            _pad(file_obj)
+            data_offset = file_obj.tell()
+            values = np.asarray(coeffs, dtype="<f8")
+            if values.ndim != 1 or values.size == 0:
+                raise ValueError("Invalid coefficients", name)
+            file_obj.write(values.tobytes())
+
+            exact_offset = file_obj.tell()
+            if exact_coeffs is not None:
+                if len(exact_coeffs) != values.size:
+                    raise ValueError("Exact coefficients do not match", name)
+                for value in exact_coeffs:
+                    value = fractions.Fraction(value)
+                    file_obj.write(_encode_int(value.numerator))
+                    file_obj.write(_encode_int(value.denominator))
+            exact_length = file_obj.tell() - exact_offset
+            degree = values.size - 1
+            entries.append(
+                (name, degree, data_offset, exact_offset, exact_length)
+            )
+
+        name_offsets = []
+        for name, *_ in entries:
+            encoded = name.encode("utf-8")
+            name_offsets.append((file_obj.tell(), len(encoded)))
+            file_obj.write(encoded)
+
+        _pad(file_obj)
+        index_offset = file_obj.tell()
+        for (name_offset, name_length), entry in zip(name_offsets, entries):
+            _, degree, data_offset, exact_offset, exact_length = entry
+            file_obj.write(
+                INDEX_ENTRY.pack(
+                    name_offset,
+                    name_length,
+                    degree,
+                    data_offset,
+                    exact_offset,
+                    exact_length,
+                )
+            )
+
+        file_obj.seek(0)
+        file_obj.write(
+            HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), index_offset)
+        )
+
+
+class Registry(object):
+    """A (lazily loaded) registry of polynomials.
+
+    Coefficients are returned as read-only views into the memory-mapped
+    file; these views must be released before :meth:`close` is called.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file_obj:
+            self._mmap = mmap.mmap(
+                file_obj.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        magic, version, self._count, self._index_offset = HEADER.unpack_from(
+            self._mmap, 0
+        )
+        if magic != MAGIC:
+            raise ValueError(path, "Not a polynomial registry")
+        if version != FORMAT_VERSION:
+            raise ValueError(path, "Unsupported version", version)
+        self._positions = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, position):
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        offset = self._index_offset + position * INDEX_ENTRY.size
+        return INDEX_ENTRY.unpack_from(self._mmap, offset)
+
+    def _name(self, entry):
+        name_offset, name_length = entry[:2]
+        return self._mmap[name_offset : name_offset + name_length].decode(
+            "utf-8"
+        )
+
+    def _position(self, name):
+        if self._positions is None:
+            self._positions = {
+                self._name(self._entry(position)): position
+                for position in range(self._count)
+            }
+        return self._positions[name]
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self._name(self._entry(position))
+
+    def __contains__(self, name):
+        try:
+            self._position(name)
+        except KeyError:
+            return False
+        return True
+
+    def coeffs(self, position):
+        """Get the coefficients of the polynomial at ``position``."""
+        _, _, degree, data_offset, _, _ = self._entry(position)
+        return np.frombuffer(
+            self._mmap, dtype="<f8", count=degree + 1, offset=data_offset
+        )
+
+    def __getitem__(self, name):
+        return self.coeffs(self._position(name))
+
+    def exact(self, name):
+        """Get the exact coefficients of a polynomial.
+
+        Returns a tuple of :class:`fractions.Fraction` or :data:`None` if
+        no exact coefficients were stored.
+        """
+        entry = self._entry(self._position(name))
+        _, _, degree, _, exact_offset, exact_length = entry
+        if exact_length == 0:
+            return None
+
+        values = []
+        offset = exact_offset
+        for _ in range(degree + 1):
+            numerator, offset = _decode_int(self._mmap, offset)
+            denominator, offset = _decode_int(self._mmap, offset)
+            values.append(fractions.Fraction(numerator, denominator))
+        return tuple(values)
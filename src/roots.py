@@ -0,0 +1,333 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Isolates the roots of a polynomial in Bernstein form.
+
+The roots in :math:`\left[0, 1\right]` are isolated by repeated
+subdivision (see :func:`de_casteljau.subdivide`), using two properties
+of the Bernstein basis to prune the search:
+
+* The number of sign changes :math:`V` in the coefficients is an upper
+  bound for the number of roots in :math:`\left(0, 1\right)` (and has
+  the same parity). If :math:`V = 0` there are no roots and if
+  :math:`V = 1` there is exactly one.
+* The roots lie in the intersection of the :math:`s`-axis with the
+  convex hull of the control points :math:`(j / n, p_j)`. When this
+  intersection is small, the interval is clipped to it rather than
+  bisected.
+
+Pending intervals are kept in a (FIFO) work queue. With exact
+(:class:`fractions.Fraction`) coefficients each subdivision is exact,
+so the results are certified. In that case the clip points are rounded
+to a dyadic grid, so the control points don't grow without bound. With
+floats the subdivisions are rounded, so ill-conditioned roots may only
+be isolated approximately.
+
+Since ``coeffs[0]`` and ``coeffs[-1]`` are the values at the endpoints,
+exact roots at :math:`s = 0` and :math:`s = 1` are read off directly.
+"""
+
+import collections
+import fractions
+import math
+
+import compensated
+import de_casteljau
+import running_error
+
+
+# Intervals narrower than this are reported (as clusters) rather than
+# subdivided further.
+DEFAULT_TOL = 0.5 ** 20
+# Intervals are clipped to the convex hull only if that removes at least
+# half of the interval (otherwise they are bisected).
+CLIP_RATIO = 0.5
+# The convex hull is widened by this amount (relative to the width of
+# the interval) to account for rounding in the control points.
+CLIP_MARGIN = 0.5 ** 10
+
+# Newton's method stops once a step is this small (relative to ``s``).
+NEWTON_TOL = 0.5 ** 50
+# Once a step is this small (relative to ``s``), Newton's method also
+# stops if the steps stop shrinking, i.e. if the iterates are limited by
+# rounding errors in the value.
+NEWTON_STALL_TOL = 0.5 ** 20
+NEWTON_MAX_ITERATIONS = 50
+# Newton's method converges linearly (with ratio ``(m - 1) / m``) to a
+# root of multiplicity ``m``. Once this many consecutive step ratios
+# agree to within a (relative) tolerance, the multiplicity is estimated
+# from them and used to correct the steps.
+NEWTON_RATIO_STEPS = 3
+NEWTON_RATIO_TOL = 0.5 ** 10
+# The multiplicity is only accepted if the first scaled step reduces the
+# (plain) step by at least this factor, i.e. if the iterates converge
+# much faster than before.
+NEWTON_ACCEPT_RATIO = 0.5 ** 4
+# Once the steps at a multiple root stop converging, the last point is
+# only accepted if its value is within this factor of the (running)
+# bound on its rounding error.
+NEWTON_NOISE_FACTOR = 4.0
+
+# ``kind`` is one of "root" (an exact root, with ``start == end``),
+# "isolated" (exactly one simple root in ``(start, end)``) or "cluster"
+# (at most ``variations`` roots in ``(start, end)``).
+Interval = collections.namedtuple(
+    "Interval", ["start", "end", "kind", "variations"]
+)
+
+
+def sign_variations(coeffs):
+    """Count the sign changes in ``coeffs`` (ignoring zeros)."""
+    variations = 0
+    previous = 0
+    for coeff in coeffs:
+        if coeff == 0:
+            continue
+        if (coeff > 0) != (previous > 0) and previous != 0:
+            variations += 1
+        previous = coeff
+    return variations
+
+
+def hull_intersection(coeffs):
+    """Intersect the convex hull of the control points with the axis.
+
+    Returns the (local) bounds ``(lo, hi)`` of the intersection or
+    :data:`None` if it is empty. The intersection is spanned by the zero
+    control points and the intersections of the segments between each
+    pair of control points with opposite signs.
+    """
+    degree = len(coeffs) - 1
+    lo = hi = None
+    for i, left in enumerate(coeffs):
+        if left == 0:
+            candidates = [i]
+        else:
+            candidates = [
+                i + (j - i) * left / (left - right)
+                for j, right in enumerate(coeffs[i + 1 :], start=i + 1)
+                if (left > 0) != (right > 0) and right != 0
+            ]
+        for candidate in candidates:
+            if lo is None or candidate < lo:
+                lo = candidate
+            if hi is None or candidate > hi:
+                hi = candidate
+
+    if lo is None:
+        return None
+    return lo / degree, hi / degree
+
+
+def _clip(coeffs, lo, hi, grid=None):
+    """Restrict ``coeffs`` to the (local) interval ``[lo, hi]``.
+
+    If ``grid`` is provided, each split point is rounded outward to a
+    multiple of ``grid`` (relative to the interval being split), so that
+    exact subdivisions are done at short dyadic points. Otherwise the
+    size of the (rational) control points would compound with each clip.
+    Returns the restricted coefficients along with the bounds used.
+    """
+    if grid is not None:
+        lo = math.floor(lo / grid) * grid
+    if lo > 0:
+        _, coeffs, _ = de_casteljau.subdivide(lo, coeffs)
+    if hi < 1:
+        local_hi = (hi - lo) / (1 - lo)
+        if grid is not None:
+            local_hi = math.ceil(local_hi / grid) * grid
+            hi = min(lo + local_hi * (1 - lo), 1)
+        if hi < 1:
+            coeffs, _, _ = de_casteljau.subdivide(local_hi, coeffs)
+    return coeffs, lo, hi
+
+
+def isolate(coeffs, tol=DEFAULT_TOL):
+    r"""Isolate the roots of a polynomial in :math:`\left[0, 1\right]`.
+
+    If every coefficient is an :class:`int` or a
+    :class:`fractions.Fraction`, the subdivisions are done exactly
+    (and the results are certified). Returns a pair of the
+    :class:`Interval`-s found (sorted by ``start``) and the number of
+    subdivisions (i.e. de Casteljau passes) used.
+    """
+    exact_types = (int, fractions.Fraction)
+    if all(isinstance(coeff, exact_types) for coeff in coeffs):
+        coeffs = [fractions.Fraction(coeff) for coeff in coeffs]
+        half = fractions.Fraction(1, 2)
+        margin = grid = fractions.Fraction(CLIP_MARGIN)
+    else:
+        coeffs = list(coeffs)
+        half = 0.5
+        margin = CLIP_MARGIN
+        grid = None
+    degree = len(coeffs) - 1
+    if degree < 1 or all(coeff == 0 for coeff in coeffs):
+        raise ValueError("Expected a non-zero, non-constant polynomial")
+
+    # NOTE: Exact roots are only checked for at points where an interval
+    #       is split (or clipped), so that each is found once.
+    found = []
+    if coeffs[0] == 0:
+        found.append(Interval(0, 0, "root", 0))
+    if coeffs[-1] == 0:
+        found.append(Interval(1, 1, "root", 0))
+
+    subdivisions = 0
+    queue = collections.deque([(0, 1, coeffs)])
+    while queue:
+        start, end, local = queue.popleft()
+        variations = sign_variations(local)
+        if variations == 0:
+            continue
+        if variations == 1:
+            found.append(Interval(start, end, "isolated", 1))
+            continue
+        width = end - start
+        if width < tol:
+            found.append(Interval(start, end, "cluster", variations))
+            continue
+
+        bounds = hull_intersection(local)
+        lo = max(bounds[0] - margin, 0)
+        hi = min(bounds[1] + margin, 1)
+        if hi - lo <= CLIP_RATIO:
+            local, lo, hi = _clip(local, lo, hi, grid=grid)
+            subdivisions += (lo > 0) + (hi < 1)
+            new_start = start + lo * width
+            new_end = start + hi * width
+            if lo > 0 and local[0] == 0:
+                found.append(Interval(new_start, new_start, "root", 0))
+            if hi < 1 and local[-1] == 0:
+                found.append(Interval(new_end, new_end, "root", 0))
+            queue.append((new_start, new_end, local))
+            continue
+
+        left, right, value = de_casteljau.subdivide(half, local)
+        subdivisions += 1
+        middle = start + half * width
+        if value == 0:
+            found.append(Interval(middle, middle, "root", 0))
+        queue.append((start, middle, left))
+        queue.append((middle, end, right))
+
+    found.sort(key=lambda interval: (interval.start, interval.end))
+    return found, subdivisions
+
+
+def newton(
+    s,
+    coeffs,
+    tol=NEWTON_TOL,
+    max_iterations=NEWTON_MAX_ITERATIONS,
+    compensate=False,
+):
+    r"""Refine a root with Newton's method.
+
+    Each iterate uses a single pass of :func:`de_casteljau.derivatives`
+    (or :func:`compensated.derivatives`, if ``compensate`` is
+    :data:`True`) to compute both the value and the derivative. Returns
+    the pair ``(s, iterations)``.
+
+    Near a root of multiplicity :math:`m` the steps only shrink by a
+    constant ratio :math:`q = (m - 1) / m`. Once the ratio settles (see
+    :data:`NEWTON_RATIO_STEPS`), the multiplicity
+    :math:`m \approx 1 / (1 - q)` is estimated and each step is scaled by
+    :math:`m`, which restores fast convergence. The multiplicity is only
+    kept if the first scaled step reduces both :math:`|p(s)|` and the
+    step (see :data:`NEWTON_ACCEPT_RATIO`). Otherwise the plain step is
+    taken instead (far from the roots, the steps can also shrink by a
+    steady ratio).
+
+    Near an ill-conditioned root the computed values are dominated by
+    rounding errors, so the iterates stall rather than converge; in
+    that case the iteration stops once the steps stop shrinking (see
+    :data:`NEWTON_STALL_TOL`). Once the steps at a multiple root stop
+    converging, the last point is only returned if its value can't be
+    distinguished from zero (see :data:`NEWTON_NOISE_FACTOR`). Raises a
+    :exc:`ValueError` if the iterates don't converge.
+    """
+    if compensate:
+        derivatives = compensated.derivatives
+    else:
+        derivatives = de_casteljau.derivatives
+
+    previous = float("inf")
+    previous_ratio = None
+    steady = 0
+    multiplicity = 1
+    confirmed = rejected = False
+    # The last point, value, derivative and (plain) step, used to check
+    # the multiplicity.
+    last = None
+    for iteration in range(1, max_iterations + 1):
+        value, derivative = derivatives(s, coeffs)
+        if value == 0:
+            return s, iteration
+        if derivative == 0:
+            raise ValueError("Zero derivative", s)
+        step = abs(value / derivative)
+
+        if multiplicity > 1 and not confirmed:
+            last_s, last_value, last_derivative, last_step = last
+            if (
+                abs(value) < abs(last_value)
+                and step <= NEWTON_ACCEPT_RATIO * last_step
+            ):
+                confirmed = True
+            else:
+                # The steps were not from a multiple root (e.g. the
+                # iterates were far from every root), so take the plain
+                # step (from the last point) instead.
+                multiplicity = 1
+                rejected = True
+                s, value, derivative, step = last
+                previous = float("inf")
+                steady = 0
+        elif confirmed and (step >= previous or abs(value) >= abs(last[1])):
+            # The convergence has stopped, which is expected once the
+            # values are dominated by rounding errors (a root of
+            # multiplicity ``m`` can only be found to within about
+            # ``u^(1 / m)``). The last point is only returned if its
+            # value can't be distinguished from zero.
+            last_s, last_value, _, _ = last
+            _, abs_bound = running_error.basic(last_s, coeffs)
+            if abs(last_value) <= NEWTON_NOISE_FACTOR * abs_bound:
+                return last_s, iteration
+            raise ValueError("Newton's method did not converge", last_s)
+
+        if step >= previous and previous <= NEWTON_STALL_TOL * abs(s):
+            return s, iteration
+        ratio = step / previous
+        if (
+            previous_ratio is not None
+            and 0.5 <= ratio < 1
+            and abs(ratio - previous_ratio) <= NEWTON_RATIO_TOL * ratio
+        ):
+            steady += 1
+        else:
+            steady = 0
+        if (
+            multiplicity == 1
+            and not rejected
+            and steady >= NEWTON_RATIO_STEPS - 1
+        ):
+            multiplicity = int(round(1 / (1 - ratio)))
+
+        last = s, value, derivative, step
+        s -= multiplicity * value / derivative
+        if multiplicity * step <= tol * abs(s):
+            return s, iteration
+        previous = step
+        previous_ratio = ratio
+
+    raise ValueError("Newton's method did not converge", s)
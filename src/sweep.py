@@ -0,0 +1,102 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs the (independent) tasks in an experiment sweep.
+
+The tasks are spread across a pool of worker processes in chunks and
+the results are always returned in the same order as the tasks, so the
+output does not depend on the number of workers. Using a single process
+runs the sweep serially (without creating a pool).
+
+The function being applied must be picklable, i.e. defined at the top
+level of a module.
+"""
+
+import functools
+import itertools
+import multiprocessing
+import os
+
+
+# Number of chunks handed to each worker (on average) by ``run()``.
+CHUNKS_PER_WORKER = 4
+
+
+def default_processes():
+    """Get the default number of worker processes.
+
+    Can be set via the ``SWEEP_PROCESSES`` environment variable and
+    otherwise uses every available CPU.
+    """
+    value = os.environ.get("SWEEP_PROCESSES")
+    if value is not None:
+        return int(value)
+
+    return os.cpu_count() or 1
+
+
+def run(func, tasks, processes=None, chunksize=None):
+    """Apply ``func`` to every task.
+
+    Returns a list of results (in the same order as ``tasks``). If
+    ``processes`` is not provided, :func:`default_processes` is used.
+    """
+    tasks = list(tasks)
+    if processes is None:
+        processes = default_processes()
+    processes = min(processes, len(tasks))
+    if processes <= 1:
+        return [func(task) for task in tasks]
+
+    if chunksize is None:
+        num_chunks = CHUNKS_PER_WORKER * processes
+        chunksize = max(1, -(-len(tasks) // num_chunks))
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(func, tasks, chunksize)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _apply(func, task):
+    s, coeffs = task
+    return func(s, coeffs)
+
+
+def evaluate(func, s_vals, coeffs_list, processes=None, chunksize=None):
+    """Evaluate ``func(s, coeffs)`` for every polynomial and point.
+
+    Returns a list with one row per polynomial in ``coeffs_list``, each
+    containing one result per point in ``s_vals``.
+    """
+    s_vals = list(s_vals)
+    coeffs_list = list(coeffs_list)
+    tasks = [
+        (s, coeffs) for coeffs, s in itertools.product(coeffs_list, s_vals)
+    ]
+    results = run(
+        functools.partial(_apply, func),
+        tasks,
+        processes=processes,
+        chunksize=chunksize,
+    )
+
+    num_points = len(s_vals)
+    if num_points == 0:
+        return [[] for _ in coeffs_list]
+
+    return [
+        results[index : index + num_points]
+        for index in range(0, len(results), num_points)
+    ]
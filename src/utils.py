@@ -11,11 +11,14 @@
 # limitations under the License.
 
 import fractions
+import functools
 import math
 import os
 
 
 U = fractions.Fraction(1, 2 ** 53)
+# The number of rows kept by ``binomial_row()``.
+BINOMIAL_CACHE_SIZE = 64
 
 
 def binomial(n, k):
@@ -27,6 +30,26 @@ def binomial(n, k):
     return float(result)
 
 
+@functools.lru_cache(maxsize=BINOMIAL_CACHE_SIZE)
+def binomial_row(n):
+    """Compute every binomial coefficient ``binomial(n, k)``.
+
+    The row is computed with (exact) integer arithmetic and is checked
+    for exactness once. The most recently used rows are cached.
+    """
+    row = [1]
+    for k in range(1, n + 1):
+        row.append(row[-1] * (n - k + 1) // k)
+
+    try:
+        float_row = tuple(float(value) for value in row)
+    except OverflowError:
+        float_row = None
+    if float_row != tuple(row):
+        raise ValueError("Cannot be represented exactly")
+    return float_row
+
+
 def set_styles():
     """Set the styles used for plotting."""
     import seaborn
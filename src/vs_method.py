@@ -19,9 +19,17 @@ This method has been described in the 1D case in a `survey`_
 paper that followed the original formulation.
 """
 
+import functools
+
+import numpy as np
+
 import utils
 
 
+# The number of coefficient sets kept by ``scaled_coeffs()``.
+SCALED_CACHE_SIZE = 128
+
+
 def basic(s, coeffs):
     n = len(coeffs) - 1
     r = 1.0 - s
@@ -33,13 +41,100 @@ def basic(s, coeffs):
         multiplier = r
         coeffs = coeffs[::-1]
 
+    binom_row = utils.binomial_row(n)
     result = coeffs[0]
     for j in range(1, n + 1):
-        binom_val = utils.binomial(n, j)
-        modified_coeff = binom_val * coeffs[j]
+        modified_coeff = binom_row[j] * coeffs[j]
         result = result * sigma + modified_coeff
 
     for _ in range(n):
         result = multiplier * result
 
     return result
+
+
+@functools.lru_cache(maxsize=SCALED_CACHE_SIZE)
+def scaled_coeffs(coeffs):
+    """Compute the binomial-scaled coefficients used by the VS method.
+
+    Returns a pair: the scaled coefficients used when ``s >= 0.5`` and
+    those used when ``s < 0.5`` (i.e. with ``coeffs`` reversed). The
+    most recently used coefficient sets are cached, so ``coeffs`` must
+    be hashable (e.g. a :class:`tuple`).
+    """
+    n = len(coeffs) - 1
+    binom_row = utils.binomial_row(n)
+    orientations = []
+    for oriented in (coeffs, coeffs[::-1]):
+        scaled = [oriented[0]]
+        for j in range(1, n + 1):
+            scaled.append(binom_row[j] * oriented[j])
+        orientations.append(tuple(scaled))
+
+    return tuple(orientations)
+
+
+def cached(s, coeffs):
+    """Performs the VS method with cached binomial-scaled coefficients.
+
+    This computes the same value as :func:`basic` (bit for bit), but
+    re-uses the scaled coefficients from :func:`scaled_coeffs` across
+    calls, so each evaluation only requires :math:`O(n)` operations.
+    """
+    forward, backward = scaled_coeffs(tuple(coeffs))
+    n = len(forward) - 1
+    r = 1.0 - s
+    if s >= 0.5:
+        sigma = r / s
+        multiplier = s
+        scaled = forward
+    else:
+        sigma = s / r
+        multiplier = r
+        scaled = backward
+
+    result = scaled[0]
+    for j in range(1, n + 1):
+        result = result * sigma + scaled[j]
+
+    for _ in range(n):
+        result = multiplier * result
+
+    return result
+
+
+def evaluate_many(s_vals, coeffs):
+    """Performs the VS method at many points.
+
+    The points with ``s >= 0.5`` and ``s < 0.5`` are masked off and each
+    group is evaluated (as NumPy arrays) with the same sequence of
+    operations as :func:`basic`, so each value agrees with :func:`basic`
+    bit for bit.
+    """
+    s_vals = np.asarray(s_vals, dtype=np.float64)
+    forward, backward = scaled_coeffs(tuple(coeffs))
+    n = len(forward) - 1
+
+    result = np.empty(s_vals.shape)
+    upper = s_vals >= 0.5
+    for mask, scaled in ((upper, forward), (~upper, backward)):
+        s_part = s_vals[mask]
+        r_part = 1.0 - s_part
+        if scaled is forward:
+            sigma = r_part / s_part
+            multiplier = s_part
+        else:
+            sigma = s_part / r_part
+            multiplier = r_part
+
+        part = np.full(s_part.shape, scaled[0], dtype=np.float64)
+        for j in range(1, n + 1):
+            part *= sigma
+            part += scaled[j]
+
+        for _ in range(n):
+            part *= multiplier
+
+        result[mask] = part
+
+    return result